@@ -73,6 +73,14 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        # uvicorn.Config(loop="uvloop") no aplica aquí: el servidor corre dentro de este loop
+        try:
+            import uvloop
+            loop_factory = uvloop.new_event_loop
+        except ImportError:
+            logger.warning("⚠️ uvloop no disponible, usando el event loop por defecto de asyncio")
+            loop_factory = None
+
+        asyncio.run(main(), loop_factory=loop_factory)
     except (KeyboardInterrupt, SystemExit):
         pass
\ No newline at end of file
@@ -74,11 +74,12 @@ class AlertsService:
 
     # --- LÓGICA DE INCIDENCIAS DE TRANSPORTE ---
 
-    async def _notify_user(self, user: User, alert: Alert):
+    async def _notify_user(self, user: User, alert: Alert, already_checked: bool = False):
         async with self._semaphore:            
-            already_sent = await self.user_data_manager.has_notification_been_sent(user.user_id, alert.id)
-            if already_sent:
-                return
+            if not already_checked:
+                already_sent = await self.user_data_manager.has_notification_been_sent(user.user_id, alert.id)
+                if already_sent:
+                    return
 
             try:
                 if user.fcm_token:
@@ -142,11 +143,26 @@ class AlertsService:
             users_data = await self.user_data_manager.get_users_for_card_alerts(current_hour)
             if not users_data: return
 
-            tasks = []
-            for user, settings in users_data:
+            # 1. Consultas de tarjetas en paralelo (acotadas al tamaño del pool de la DB)
+            db_semaphore = asyncio.Semaphore(5)
+
+            async def fetch_expiring_cards(user: User, settings):
                 target_date = now.date() + timedelta(days=settings.card_alert_days_before)
-                expiring_cards = await self.user_data_manager.get_user_cards_expiring_on(int(user.user_id), target_date)
-                
+                async with db_semaphore:
+                    return await self.user_data_manager.get_user_cards_expiring_on(int(user.user_id), target_date)
+
+            cards_per_user = await asyncio.gather(
+                *[fetch_expiring_cards(user, settings) for user, settings in users_data],
+                return_exceptions=True
+            )
+
+            # 2. Construcción de notificaciones (solo CPU)
+            tasks = []
+            for (user, settings), expiring_cards in zip(users_data, cards_per_user):
+                if isinstance(expiring_cards, Exception):
+                    logger.error(f"Error fetching expiring cards for user {user.user_id}: {expiring_cards}")
+                    continue
+
                 if expiring_cards:
                     tasks.append(self._notify_card_expiration(user, expiring_cards, settings.card_alert_days_before))
 
@@ -194,15 +210,27 @@ class AlertsService:
 
             logger.info(f"🔎 Checking {len(active_recent_alerts)} recent alerts for {len(users_data)} users...")
 
+            # Una sola consulta para saber qué pares (usuario, alerta) ya se notificaron
+            sent_keys = await self.user_data_manager.get_sent_notification_keys(
+                [alert.id for alert in active_recent_alerts]
+            )
+
+            # users_data trae una entrada por dispositivo: al encolar marcamos el par
+            # (usuario, alerta) como enviado para no repetir la alerta en cada dispositivo
             tasks = []
             for user, favorites in users_data:
                 notifications_enabled = user.settings.general_notifications_enabled if user.settings else True
                 if not notifications_enabled:
                     continue
 
+                user_key = str(user.user_id)
                 for alert in active_recent_alerts:
+                    sent_key = (user_key, str(alert.id))
+                    if sent_key in sent_keys:
+                        continue
                     if self._is_alert_relevant_for_user(alert, favorites):
-                        tasks.append(self._notify_user(user, alert))
+                        sent_keys.add(sent_key)
+                        tasks.append(self._notify_user(user, alert, already_checked=True))
 
             if tasks:
                 logger.info(f"📨 Dispatching {len(tasks)} potential notifications...")
@@ -217,17 +245,19 @@ class AlertsService:
         if not alert.transport_type: 
             return False
 
+        alert_type = alert.transport_type.value
         for fav in favorites:
-            if fav.type != alert.transport_type.value: 
+            if fav.type != alert_type: 
                 continue
 
+            fav_line_code = str(fav.line_code) if fav.line_code else None
             for entity in alert.affected_entities:
                 if entity.station_code:
                     if str(entity.station_code) == fav.station_code:
                         return True
                 
                 elif entity.line_code:
-                    if fav.line_code and str(entity.line_code) == str(fav.line_code):
+                    if fav_line_code and str(entity.line_code) == fav_line_code:
                         return True
 
         return False
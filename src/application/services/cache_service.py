@@ -1,5 +1,6 @@
 import time
 import asyncio
+import logging
 from typing import Any, Optional
 from src.core.logger import logger
 
@@ -12,27 +13,34 @@ class CacheService:
         logger.debug("[CacheService] Initialized")
 
     async def set(self, key: str, value: Any, ttl: Optional[int] = None):
-        start = time.perf_counter()
+        # Se guarda la referencia tal cual: no hay serialización en la caché en memoria
+        debug = logger.isEnabledFor(logging.DEBUG)
+        start = time.perf_counter() if debug else 0.0
         expire_at = time.time() + ttl if ttl else None
         async with self._lock:
             self._cache[key] = (value, expire_at)
-        duration = time.perf_counter() - start
-        logger.debug(f"[CacheService] Set key '{key}' with ttl={ttl} in {duration:.4f}s")
+        if debug:
+            duration = time.perf_counter() - start
+            logger.debug(f"[CacheService] Set key '{key}' with ttl={ttl} in {duration:.4f}s")
 
     async def get(self, key: str) -> Optional[Any]:
-        start = time.perf_counter()
+        debug = logger.isEnabledFor(logging.DEBUG)
+        start = time.perf_counter() if debug else 0.0
         async with self._lock:
-            if key in self._cache:
-                value, expire_at = self._cache[key]
+            entry = self._cache.get(key)
+            if entry is not None:
+                value, expire_at = entry
                 if expire_at is None or expire_at > time.time():
-                    duration = time.perf_counter() - start
-                    logger.debug(f"[CacheService] Cache hit for key '{key}' in {duration:.4f}s")
+                    if debug:
+                        duration = time.perf_counter() - start
+                        logger.debug(f"[CacheService] Cache hit for key '{key}' in {duration:.4f}s")
                     return value
                 else:
                     del self._cache[key]
-                    duration = time.perf_counter() - start
-                    logger.debug(f"[CacheService] Cache expired for key '{key}' in {duration:.4f}s")
-            else:
+                    if debug:
+                        duration = time.perf_counter() - start
+                        logger.debug(f"[CacheService] Cache expired for key '{key}' in {duration:.4f}s")
+            elif debug:
                 duration = time.perf_counter() - start
                 logger.debug(f"[CacheService] Cache miss for key '{key}' in {duration:.4f}s")
         return None
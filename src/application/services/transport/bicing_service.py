@@ -1,5 +1,5 @@
 from datetime import datetime
-from rapidfuzz import process, fuzz
+from rapidfuzz import process, fuzz, utils
 from typing import Any, Callable, List, Optional
 from src.domain.models.common.search_result import StationSearchResult
 from src.application.utils.html_helper import HtmlHelper
@@ -10,6 +10,7 @@ from src.infrastructure.database.repositories.bicing_repository import BicingRep
 from src.infrastructure.database.database import async_session_factory
 from src.domain.models.bicing.bicing_station import BicingStation
 from src.core.logger import logger
+from .service_base import ServiceBase
 
 class BicingService:
 
@@ -83,17 +84,16 @@ class BicingService:
         if not station_name:
             return db_stations
         
-        db_stations = await self.bicing_repository.get_all()
-        
         stations = [
             self._map_db_bicing_to_station_search_result(db_station) 
             for db_station in db_stations
         ]
         
+        # Nombres extraídos directamente de las filas: fuzzy_search no llama a `key` por item
         return self.fuzzy_search(
                 query=station_name, 
                 items=stations, 
-                key=lambda s: s.station_name, 
+                choices=[db_station.name for db_station in db_stations],
                 threshold=75
             )
 
@@ -176,47 +176,57 @@ class BicingService:
         except (ValueError, TypeError):
             return 0
 
-    def fuzzy_search(self, query: str, items: List[StationSearchResult], key: Callable[[Any], str], threshold: float = 75) -> List[StationSearchResult]:
+    def fuzzy_search(self, query: str, items: List[StationSearchResult], key: Optional[Callable[[Any], str]] = None, threshold: float = 75, limit: int = 20, scorer: Optional[Callable[..., float]] = None, choices: Optional[List[str]] = None) -> List[StationSearchResult]:
+        # `choices` son los nombres ya extraídos y alineados por índice con `items`
+        if choices is None:
+            choices = [key(item) for item in items]
+
         query_lower = query.lower()
         query_norm = HtmlHelper.normalize_text(query_lower)
 
-        # 1. Exact Matches (Puntuación máxima)
-        exact_matches = []
-        for item in items:
-            if query_lower in key(item).lower():
-                item.match_score = 100.0
-                exact_matches.append(item)
-
-        # 2. Normalized Matches (Puntuación alta, pero menor que exacta)
-        # Excluimos lo que ya encontramos en exact_matches
-        remaining_after_exact = [item for item in items if item not in exact_matches]
-        normalized_matches = []
-        for item in remaining_after_exact:
-            if query_norm in HtmlHelper.normalize_text(key(item).lower()):
-                item.match_score = 95.0
-                normalized_matches.append(item)
+        # 1. + 2. Exact y Normalized Matches en una sola pasada
+        # Cada nombre se normaliza una única vez; lo que no coincide se guarda por índice
+        exact_idx = []
+        normalized_idx = []
+        remaining_idx = []
+        for i, name in enumerate(choices):
+            name_lower = name.lower()
+
+            if query_lower in name_lower:
+                exact_idx.append(i)
+            elif query_norm in HtmlHelper.normalize_text(name_lower):
+                normalized_idx.append(i)
+            else:
+                remaining_idx.append(i)
+
+        # Mismo tope que ServiceBase.fuzzy_search: exactas, luego normalizadas y luego fuzzy hasta `limit`
+        results = []
+        for idx_list, score in ((exact_idx, 100.0), (normalized_idx, 95.0)):
+            for i in idx_list[:limit - len(results)]:
+                item = items[i]
+                item.match_score = score
+                results.append(item)
+            if len(results) >= limit:
+                return results
 
         # 3. Fuzzy Matches (Puntuación real de la librería)
-        # Solo procesamos lo que no ha coincidido con los métodos anteriores
-        all_found = exact_matches + normalized_matches
-        remaining_items = [item for item in items if item not in all_found]
-        
-        # Creamos un mapa para recuperar el objeto por su nombre/key
-        item_dict = {key(item): item for item in remaining_items}
-        
-        fuzzy_results = process.extract(
-            query=query,
-            choices=item_dict.keys(),
-            scorer=fuzz.WRatio,
-            limit=20 # Limitamos para no procesar miles de resultados irrelevantes
-        )
-
-        fuzzy_filtered = []
-        for name, score, _ in fuzzy_results:
-            if score >= threshold:
-                item = item_dict[name]
-                item.match_score = float(score)
-                fuzzy_filtered.append(item)
+        # Solo procesamos lo que no ha coincidido con los métodos anteriores.
+        # cdist puntúa todos los candidatos de golpe en C++ y nos da un score por índice
+        if remaining_idx:
+            scores = process.cdist(
+                [query],
+                [choices[i] for i in remaining_idx],
+                scorer=scorer or fuzz.WRatio, # fuzz.token_set_ratio es opcional vía `scorer`
+                processor=utils.default_process, # rapidfuzz >= 3 no normaliza por defecto
+                score_cutoff=threshold,
+                workers=-1
+            )[0]
+
+            # Solo los huecos que quedan libres
+            for idx in ServiceBase._top_hits(scores, threshold, limit - len(results)):
+                item = items[remaining_idx[idx]]
+                item.match_score = float(scores[idx])
+                results.append(item)
 
         # Devolvemos todo combinado
-        return exact_matches + normalized_matches + fuzzy_filtered
\ No newline at end of file
+        return results
@@ -1,4 +1,5 @@
 import asyncio
+import logging
 import time
 from typing import List, Optional
 
@@ -136,8 +137,9 @@ class BusService(ServiceBase):
                 elif line.name.upper().startswith(bus_cat_upper):
                     result.append(line)
 
-        elapsed = time.perf_counter() - start
-        logger.info(f"[{self.__class__.__name__}] get_lines_by_category({bus_category}) -> {len(result)} lines ({elapsed:.4f} s)")
+        if logger.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - start
+            logger.debug(f"[{self.__class__.__name__}] get_lines_by_category({bus_category}) -> {len(result)} lines ({elapsed:.4f} s)")
         return result
 
     # =========================================================================
@@ -164,8 +166,9 @@ class BusService(ServiceBase):
         if len(routes) == 0:
             return await AmbApiService.get_next_arrivals(external_code)
         
-        elapsed = time.perf_counter() - start
-        logger.info(f"[{self.__class__.__name__}] get_stop_routes({external_code}) -> iBus Data ({elapsed:.4f} s)")
+        if logger.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - start
+            logger.debug(f"[{self.__class__.__name__}] get_stop_routes({external_code}) -> iBus Data ({elapsed:.4f} s)")
         return routes
     
 
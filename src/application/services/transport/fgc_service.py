@@ -1,4 +1,5 @@
 import asyncio
+import logging
 import time
 from typing import List, Optional
 
@@ -174,9 +175,10 @@ class FgcService(ServiceBase):
             except Exception as e:
                 logger.error(f"FGC Fallback API failed for {physical_station_id}: {e}")
 
-        elapsed = time.perf_counter() - start
-        source = "CACHE/POOL" if all_routes else "FALLBACK"
-        logger.info(f"[{self.__class__.__name__}] FGC {line_id} @ {physical_station_id} -> {len(filtered_routes)} routes ({source}) ({elapsed:.4f}s)")
+        if logger.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - start
+            source = "CACHE/POOL" if all_routes else "FALLBACK"
+            logger.debug(f"[{self.__class__.__name__}] FGC {line_id} @ {physical_station_id} -> {len(filtered_routes)} routes ({source}) ({elapsed:.4f}s)")
         
         return filtered_routes
 
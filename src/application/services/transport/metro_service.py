@@ -1,6 +1,7 @@
 import asyncio
+import logging
 import time
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from src.domain.models.common.nearby_station import NearbyStation
 from src.domain.models.metro.metro_access import MetroAccess
@@ -26,6 +27,8 @@ class MetroService(ServiceBase):
         super().__init__(cache_service, user_data_manager)
         self.tmb_api_service = tmb_api_service
         self.language_manager = language_manager
+        # Índices código/nombre -> línea de la última lista devuelta por get_all_lines
+        self._lines_index: Tuple[Optional[List[Line]], Dict[str, Line], Dict[str, Line]] = (None, {}, {})
         
         logger.info(f"[{self.__class__.__name__}] MetroService initialized")
 
@@ -50,8 +53,17 @@ class MetroService(ServiceBase):
         if not lines:
             return []
 
-        tasks = [self.fetch_stations_by_line(line.code) for line in lines]
-        results = await asyncio.gather(*tasks)
+        semaphore = asyncio.Semaphore(5)
+
+        async def fetch_line_stops(line_code):
+            async with semaphore:
+                try:
+                    return await self.fetch_stations_by_line(line_code)
+                except Exception as e:
+                    logger.error(f"Error fetching METRO line {line_code}: {e}")
+                    return []
+
+        results = await asyncio.gather(*[fetch_line_stops(line.code) for line in lines])
 
         flat_stations = [station for sublist in results for station in sublist]
         
@@ -84,12 +96,24 @@ class MetroService(ServiceBase):
         return await super().get_station_by_code(station_code, TransportType.METRO)
 
     async def get_line_by_code(self, line_code: str) -> Optional[Line]:
-        lines = await self.get_all_lines()
-        return next((l for l in lines if str(l.code) == str(line_code)), None)
+        by_code, _ = self._get_lines_index(await self.get_all_lines())
+        return by_code.get(str(line_code))
 
     async def get_line_by_name(self, line_name: str) -> Optional[Line]:
-        lines = await self.get_all_lines()
-        return next((l for l in lines if str(l.name) == str(line_name)), None)
+        _, by_name = self._get_lines_index(await self.get_all_lines())
+        return by_name.get(str(line_name))
+
+    def _get_lines_index(self, lines: List[Line]) -> Tuple[Dict[str, Line], Dict[str, Line]]:
+        # get_all_lines devuelve la misma lista mientras dure su caché: solo reindexamos si cambia
+        cached_lines, by_code, by_name = self._lines_index
+        if cached_lines is not lines:
+            by_code, by_name = {}, {}
+            for line in lines:
+                # setdefault conserva la primera coincidencia, igual que el antiguo recorrido lineal
+                by_code.setdefault(str(line.code), line)
+                by_name.setdefault(str(line.name), line)
+            self._lines_index = (lines, by_code, by_name)
+        return by_code, by_name
     
     # =========================================================================
     # ⚡ REAL TIME & SPECIFIC FEATURES
@@ -124,9 +148,10 @@ class MetroService(ServiceBase):
             logger.debug(f"Sin tiempo real para {external_code}, buscando horarios...")
             routes = await self.tmb_api_service.get_next_scheduled_metro_at_station(external_code, line_id)
         
+        target_code = str(line_metadata.code).upper()
         routes = [
             r for r in routes 
-            if str(getattr(r, 'line_code', '')).upper() == str(line_metadata.code).upper()
+            if str(getattr(r, 'line_code', '')).upper() == target_code
         ]
 
         routes = list({r.route_id: r for r in routes}.values())
@@ -134,8 +159,9 @@ class MetroService(ServiceBase):
         if routes:
             await self.cache_service.set(cache_key, routes, ttl=15)
 
-        elapsed = time.perf_counter() - start
-        logger.info(f"[{self.__class__.__name__}] get_station_routes({external_code}) -> {len(routes)} routes ({elapsed:.4f}s)")
+        if logger.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - start
+            logger.debug(f"[{self.__class__.__name__}] get_station_routes({external_code}) -> {len(routes)} routes ({elapsed:.4f}s)")
         return routes
 
     async def get_station_accesses(self, group_code_id: str) -> List[MetroAccess]:
@@ -147,6 +173,7 @@ class MetroService(ServiceBase):
             cache_ttl=86400 * 30
         )
         
-        elapsed = time.perf_counter() - start
-        logger.info(f"[{self.__class__.__name__}] get_station_accesses({group_code_id}) -> {len(data)} accesses ({elapsed:.4f}s)")
+        if logger.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - start
+            logger.debug(f"[{self.__class__.__name__}] get_station_accesses({group_code_id}) -> {len(data)} accesses ({elapsed:.4f}s)")
         return data
\ No newline at end of file
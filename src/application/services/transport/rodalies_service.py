@@ -1,4 +1,5 @@
 import asyncio
+import logging
 import time
 from typing import List, Optional
 
@@ -139,7 +140,8 @@ class RodaliesService(ServiceBase):
 
         unique_routes = list({r.route_id: r for r in filtered_routes}.values())
 
-        elapsed = time.perf_counter() - start
-        logger.info(f"[{self.__class__.__name__}] RT {line_id} @ {external_code} -> {len(unique_routes)} routes (from pool of {len(all_routes)}) ({elapsed:.4f}s)")
+        if logger.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - start
+            logger.debug(f"[{self.__class__.__name__}] RT {line_id} @ {external_code} -> {len(unique_routes)} routes (from pool of {len(all_routes)}) ({elapsed:.4f}s)")
         
         return unique_routes
\ No newline at end of file
@@ -1,12 +1,22 @@
 from abc import abstractmethod
 import asyncio
+from bisect import bisect_right
 from collections import defaultdict
-from dataclasses import asdict
+from dataclasses import asdict, is_dataclass
 from datetime import datetime
-from typing import Callable, Any, Dict, List, Optional, Set, TypeVar
+from enum import Enum
+from functools import wraps
+from itertools import islice
+from operator import attrgetter
+import json
+import logging
+from typing import Callable, Any, ClassVar, Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Tuple, TypeVar
 import time
 
-from rapidfuzz import process, fuzz
+from cachetools import LRUCache
+import numpy as np
+from pydantic import BaseModel, TypeAdapter
+from rapidfuzz import process, fuzz, utils
 
 from src.domain.models.common.search_result import StationSearchResult
 from src.infrastructure.database.repositories.alerts_repository import AlertsRepository
@@ -26,37 +36,169 @@ from src.infrastructure.database.database import async_session_factory
 from src.core.logger import logger
 from src.application.utils.html_helper import HtmlHelper
 from src.application.services.cache_service import CacheService
-from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy import text
 
 T = TypeVar("T")
 
+# Separador de los nombres unidos en un solo texto (no aparece en nombres de estación)
+_NAME_SEPARATOR = "\x00"
+
+class SearchIndex(NamedTuple):
+    """Nombres de una lista de resultados de búsqueda, alineados por índice con los items."""
+    names: List[str]
+    unique_processed: List[str]  # preprocesados para rapidfuzz, sin repetir (una estación aparece en varias líneas)
+    name_slot: np.ndarray  # por item, posición de su nombre en unique_processed
+    lower_blob: str  # nombres en minúsculas unidos por _NAME_SEPARATOR
+    lower_starts: List[int]  # posición de cada nombre dentro de lower_blob
+    normalized_blob: str
+    normalized_starts: List[int]
+
+
+def _join_names(names: List[str]) -> Tuple[str, List[int]]:
+    starts = []
+    offset = 0
+    for name in names:
+        starts.append(offset)
+        offset += len(name) + 1
+    return _NAME_SEPARATOR.join(names), starts
+
+
+def _substring_hits(needle: str, blob: str, starts: List[int]) -> Iterator[int]:
+    """
+    Índices (en orden) de los nombres de `blob` que contienen `needle`.
+    str.find recorre el texto en C: solo se ejecuta Python por cada acierto, no por cada nombre.
+    """
+    if not needle:
+        yield from range(len(starts))
+        return
+    if _NAME_SEPARATOR in needle:
+        return
+
+    pos = blob.find(needle)
+    while pos != -1:
+        i = bisect_right(starts, pos) - 1
+        yield i
+        # Un acierto por nombre: seguimos buscando desde el siguiente
+        if i + 1 >= len(starts):
+            return
+        pos = blob.find(needle, starts[i + 1])
+
+# NOTA: main.py arranca el proceso sobre uvloop; los asyncio.gather de este módulo se benefician de su scheduling.
+
+# Columnas (y orden de las tuplas) que sync_stations vuelca con COPY
+PHYSICAL_STATION_COPY_COLUMNS = [
+    "id", "name", "description", "transport_type", "latitude", "longitude",
+    "municipality", "extra_data", "lines_summary", "updated_at"
+]
+ROUTE_STOP_COPY_COLUMNS = [
+    "line_id", "physical_station_id", "station_external_code", "station_group_code",
+    "order", "direction", "is_origin", "is_destination"
+]
+
+# Validador reutilizable para las conexiones de todas las paradas de una línea (None = sin conexiones)
+_CONNECTIONS_LIST_ADAPTER = TypeAdapter(List[Optional[Connections]])
+# Lista buscable de paradas: se valida entera de una vez al (re)construir la caché
+_SEARCH_RESULTS_ADAPTER = TypeAdapter(List[StationSearchResult])
+
+# Campos que sync_lines / sync_stations guardan en columnas propias: el resto va a extra_data
+_LINE_COLUMN_FIELDS = frozenset({
+    'id', 'original_id', 'code', 'name', 'description',
+    'latitude', 'longitude', 'transport_type', 'stations',
+    'destination', 'origin', 'color', 'extra_data', 'has_alerts', 'alerts', 'name_with_emoji'
+})
+_STATION_COLUMN_FIELDS = frozenset({
+    'id', 'original_id', 'code', 'name', 
+    'lat', 'latitude', 'lon', 'longitude', 
+    'description', 'municipality', 
+    'transport_type', 'type', 
+    'line_code', 'line_name', 'order', 'direction', 
+    'is_night'
+})
+
+# Campos de Ruta: en una estación física (búsqueda global) no aplican
+_EMPTY_STATION_DEFAULTS = {
+    "code": "",
+    "order": 0,
+    "line_id": None,
+    "line_code": None,
+    "line_name": None,
+    "direction": None,
+    "outbound_code": None,
+    "return_code": None,
+    "has_alerts": False,
+}
+
 class ServiceBase:
 
+    # Claves normalizadas de cada alerta (por id de DB). Se vacía tras cada sync_alerts.
+    _alert_keys_cache: ClassVar[LRUCache] = LRUCache(maxsize=4096)
+    _alert_station_names_cache: ClassVar[LRUCache] = LRUCache(maxsize=4096)
+
+    # Metadatos de líneas compartidos por todos los servicios de transporte (una sola carga de DB)
+    LINES_CACHE_TTL: ClassVar[int] = 3600
+    ALERTS_MAP_MEMO_TTL: ClassVar[int] = 30
+    # Lista final de get_all_lines (has_alerts incluido); sync_lines y sync_alerts la invalidan
+    LINES_ENRICHED_CACHE_TTL: ClassVar[int] = 300
+    SEARCH_MEM_CACHE_TTL: ClassVar[int] = 86400
+    # WRatio tolera erratas en nombres de varias palabras ("sagarda" -> "Sagrada Família");
+    # fuzz.token_set_ratio es más barato pero opcional vía `scorer` (puntúa más bajo con el mismo threshold)
+    FUZZY_SCORER: ClassVar[Callable[..., float]] = fuzz.WRatio
+    _lines_metadata_cache: ClassVar[Dict[str, DBLine]] = {}
+    _lines_by_type_and_name: ClassVar[Dict[Tuple[str, str], DBLine]] = {}
+    _cache_last_updated: ClassVar[float] = 0
+    _lines_cache_lock: ClassVar[asyncio.Lock] = asyncio.Lock()
+
     def __init__(self, cache_service: CacheService = None, user_data_manager: UserDataManager = None):
         self.line_repository = LineRepository(async_session_factory)
         self.stations_repository = StationsRepository(async_session_factory)
         self.alerts_repository = AlertsRepository(async_session_factory)
         self.cache_service = cache_service
         self.user_data_manager = user_data_manager
-        self._lines_metadata_cache: Dict[str, DBLine] = {}
-        self._cache_last_updated = 0
+        self._search_indexes: Dict[str, Tuple[List[StationSearchResult], SearchIndex]] = {}
+        self._alerts_inflight: Dict[TransportType, asyncio.Task] = {}
+        self._alerts_ts: Dict[TransportType, float] = {}
+        self._mem_cache: Dict[str, Tuple[float, List[StationSearchResult]]] = {}
 
     async def _ensure_lines_cache(self):
-        if self._lines_metadata_cache:
+        if self._is_lines_cache_fresh():
             return
 
-        logger.info("🔄 Pre-loading lines cache for rich connections...")
-        
-        all_lines = await self.line_repository.get_all(transport_type=None)        
-        self._lines_metadata_cache = {
-            f"{line.transport_type}-{line.code}": line 
-            for line in all_lines
-        }
-        
-        logger.info(f"✅ Lines cache loaded with {len(self._lines_metadata_cache)} unique lines.")
+        async with ServiceBase._lines_cache_lock:
+            # Otro servicio pudo cargarla mientras esperábamos el lock
+            if self._is_lines_cache_fresh():
+                return
+
+            logger.info("🔄 Pre-loading lines cache for rich connections...")
+            
+            all_lines = await self.line_repository.get_all(transport_type=None)        
+            lines_metadata = {
+                f"{line.transport_type}-{line.code}": line 
+                for line in all_lines
+            }
+
+            # Índice (transport_type, name) -> línea para _build_rich_connections.
+            # setdefault conserva la primera coincidencia, igual que el antiguo recorrido lineal.
+            lines_by_type_and_name = {}
+            for line in all_lines:
+                lines_by_type_and_name.setdefault((line.transport_type, line.name), line)
+
+            ServiceBase._lines_metadata_cache = lines_metadata
+            ServiceBase._lines_by_type_and_name = lines_by_type_and_name
+            ServiceBase._cache_last_updated = time.monotonic()
+            
+            logger.info(f"✅ Lines cache loaded with {len(lines_metadata)} unique lines.")
+
+    def _is_lines_cache_fresh(self) -> bool:
+        return bool(self._lines_metadata_cache) and time.monotonic() - self._cache_last_updated < self.LINES_CACHE_TTL
 
     async def get_all_lines(self, transport_type: TransportType) -> List[Line]:
         start = time.perf_counter()
+
+        # Lista final ya construida y ordenada: ni DB ni Pydantic mientras no expire o se resincronice
+        cache_key = f"lines_enriched_{transport_type.value}"
+        cached = await self.cache_service.get(cache_key)
+        if cached is not None:
+            return cached
         
         db_lines, affected_names_set = await asyncio.gather(
             self.line_repository.get_all(transport_type.value),
@@ -66,25 +208,35 @@ class ServiceBase:
         if not db_lines:
             return []
 
-        final_lines = []
-        for model in db_lines:
-            line = Line.model_validate(model)
-            line.id = model.id
-
-            if not line.origin or not line.destination or line.origin == line.destination:
-                continue
-            
-            if model.extra_data and not getattr(line, 'category', None):
-                line.category = model.extra_data.get('category')
-            
-            line.has_alerts = line.name in affected_names_set
-            line.alerts = []
-            final_lines.append(line)
-
-        final_lines.sort(key=Utils.sort_lines)
+        # Filas de nuestra DB: construimos sin validación de Pydantic, en una sola pasada
+        # (las líneas sin origen/destino distintos se descartan antes de construir nada)
+        final_lines = sorted(
+            (
+                Line.model_construct(
+                    id=model.id,
+                    original_id=model.original_id,
+                    code=model.code,
+                    name=model.name,
+                    description=model.description,
+                    origin=model.origin,
+                    destination=model.destination,
+                    color=model.color,
+                    transport_type=transport_type,
+                    category=model.extra_data.get('category') if model.extra_data else None,
+                    has_alerts=model.name in affected_names_set,
+                    alerts=[]
+                )
+                for model in db_lines
+                if model.origin and model.destination and model.origin != model.destination
+            ),
+            key=Utils.sort_lines
+        )
         
-        elapsed = time.perf_counter() - start
-        logger.info(f"[{self.__class__.__name__}] get_all_lines -> {len(final_lines)} lines ({elapsed:.4f}s)")
+        await self.cache_service.set(cache_key, final_lines, ttl=self.LINES_ENRICHED_CACHE_TTL)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - start
+            logger.debug(f"[{self.__class__.__name__}] get_all_lines -> {len(final_lines)} lines ({elapsed:.4f}s)")
         return final_lines
 
     async def get_line_by_id(self, transport_type: TransportType, line_id: str) -> Line:
@@ -105,25 +257,45 @@ class ServiceBase:
             except ValueError:
                 return None
         
-        db_line = await self.line_repository.get_by_id(line_id)
+        # Índice {id: Line} que se va rellenando con cada línea leída de la DB (sin alertas:
+        # se enriquece una copia en cada petición). sync_lines lo invalida
+        index_key = f"lines_by_id_{transport_type.value}"
+        lines_by_id = await self.cache_service.get(index_key)
+        cached_line = lines_by_id.get(line_id) if lines_by_id else None
+
+        if cached_line is not None:
+            alerts_map = await self._get_alerts_map(transport_type)
+            line = cached_line.model_copy()
+        else:
+            # La línea y el mapa de alertas no dependen entre sí: una sola espera
+            db_line, alerts_map = await asyncio.gather(
+                self.line_repository.get_by_id(line_id),
+                self._get_alerts_map(transport_type)
+            )
 
-        if not db_line:
-            return None
-        
-        line = Line.model_validate(db_line)
-        line.id = db_line.id
+            if not db_line:
+                return None
+            
+            line = Line.model_validate(db_line)
+            line.id = db_line.id
 
-        if not line.origin or not line.destination or line.origin == line.destination:
-            return None
-        
-        if db_line.extra_data and not getattr(line, 'category', None):
-            line.category = db_line.extra_data.get('category')
+            if not line.origin or not line.destination or line.origin == line.destination:
+                return None
+            
+            if db_line.extra_data and not getattr(line, 'category', None):
+                line.category = db_line.extra_data.get('category')
+
+            if lines_by_id is None:
+                lines_by_id = {}
+                await self.cache_service.set(index_key, lines_by_id, ttl=self.LINES_CACHE_TTL)
+            lines_by_id[line_id] = line
+            line = line.model_copy()
 
-        alerts_map = await self._get_alerts_map(transport_type)
         self._enrich_with_alerts([line], alerts_map, key_attr="name")
 
-        elapsed = time.perf_counter() - start
-        logger.info(f"[{self.__class__.__name__}] get_line_by_id -> {line_id} - {transport_type} ({elapsed:.4f}s)")
+        if logger.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - start
+            logger.debug(f"[{self.__class__.__name__}] get_line_by_id -> {line_id} - {transport_type} ({elapsed:.4f}s)")
         return line
 
     async def get_stations_by_line_id(self, transport_type: TransportType, line_id: str) -> List[Station]:
@@ -142,20 +314,31 @@ class ServiceBase:
             except ValueError:
                 return []
             
-        await self._ensure_lines_cache()
-        line_metadata = self._lines_metadata_cache.get(line_id)
-        actual_line_name = line_metadata.name if line_metadata else line_id
-
-        db_results, alerts_dict = await asyncio.gather(
-            self.stations_repository.get_by_line_id(line_id),
+        # Caché de líneas y alertas en paralelo mientras se abre el cursor de paradas
+        prepare = asyncio.gather(
+            self._ensure_lines_cache(),
             self._get_alerts_map(transport_type)
         )
-
-        if not db_results:
-            return []
+        type_str = transport_type.value
+        line_context = None
 
         final_stations = []
-        for route_stop in db_results:
+        connections_payloads = []
+        async for route_stop in self.stations_repository.stream_by_line_id(line_id):
+            if line_context is None:
+                # Primera parada: a partir de aquí necesitamos la caché de líneas
+                _, alerts_dict = await prepare
+                line_metadata = self._lines_metadata_cache.get(line_id)
+                actual_line_name = line_metadata.name if line_metadata else line_id
+
+                # Todas las paradas son de la misma línea: el contexto se calcula una sola vez
+                route_line = route_stop.line
+                line_context = {
+                    "line_id": getattr(route_line, 'id', ''),
+                    "line_code": getattr(route_line, 'code', ''),
+                    "line_name": getattr(route_line, 'name', ''),
+                }
+
             physical = route_stop.station
             extra = physical.extra_data or {}
             
@@ -164,14 +347,15 @@ class ServiceBase:
             rich_connections = self._build_rich_connections(
                 line_entries=physical.lines_summary,
                 current_line_name=actual_line_name,
-                station_transport_type=transport_type
+                station_transport_type=transport_type,
+                type_str=type_str
             )
 
-            domain_obj = Station(
+            domain_obj = Station.model_construct(
                 id=physical.id,
-                original_id=physical.id.split('-')[-1] if '-' in physical.id else physical.id,
+                original_id=physical.original_id,
                 code=route_stop.station_external_code or "",
-                station_group_code=route_stop.station_group_code,
+                station_group_code=int(route_stop.station_group_code) if route_stop.station_group_code else None,
                 name=physical.name,
                 latitude=physical.latitude,
                 longitude=physical.longitude,
@@ -180,9 +364,7 @@ class ServiceBase:
                 description=physical.description,
                 
                 # Contexto
-                line_id=getattr(route_stop.line, 'id', ''),
-                line_code=getattr(route_stop.line, 'code', ''),
-                line_name=getattr(route_stop.line, 'name', ''),
+                **line_context,
                 
                 # Extra Data
                 moute_id=str(extra.get('moute_id')) if extra.get('moute_id') else None,
@@ -193,24 +375,36 @@ class ServiceBase:
                 has_alerts=False,
                 alerts=[],
 
-                # AQUI ESTÁ LA MAGIA: Pasamos el objeto rico
-                connections=rich_connections
+                # AQUI ESTÁ LA MAGIA: el objeto rico se valida después, en bloque para toda la línea
+                connections=None
             )
             final_stations.append(domain_obj)
+            connections_payloads.append(rich_connections)
+
+        if line_context is None:
+            await prepare
+            return []
+
+        # model_construct no convierte anidados: validamos todas las conexiones en una sola llamada
+        for station, connections in zip(final_stations, _CONNECTIONS_LIST_ADAPTER.validate_python(connections_payloads)):
+            station.connections = connections
 
         self._enrich_with_alerts(final_stations, alerts_dict, key_attr="name")
         return final_stations
     
-    def _build_rich_connections(self, line_entries: List[any], current_line_name: str, station_transport_type: TransportType) -> Optional[dict]:
+    def _build_rich_connections(self, line_entries: List[any], current_line_name: str, station_transport_type: TransportType, type_str: Optional[str] = None) -> Optional[dict]:
         if not line_entries:
             return None
 
         rich_lines = []
         
-        type_str = station_transport_type.value if hasattr(station_transport_type, 'value') else str(station_transport_type)
-        valid_types = {type_str}
-        if type_str == 'nitbus':
-            valid_types.add('bus')
+        # Los llamadores que mapean muchas filas pasan type_str ya calculado
+        if type_str is None:
+            type_str = station_transport_type.value if hasattr(station_transport_type, 'value') else str(station_transport_type)
+        # nitbus también puede enlazar con líneas de bus diurno
+        fallback_type = 'bus' if type_str == 'nitbus' else None
+        current_name = str(current_line_name)
+        lookup = self._lines_by_type_and_name.get
 
         for entry in line_entries:
             # --- 1. NORMALIZACIÓN (El Fix) ---
@@ -223,15 +417,13 @@ class ServiceBase:
                 fallback_color = "808080"
 
             # 2. Filtro de auto-referencia
-            if str(name) == str(current_line_name):
+            if str(name) == current_name:
                 continue
 
-            # 3. Búsqueda en Caché
-            line_data = None
-            for cached_line in self._lines_metadata_cache.values():
-                if cached_line.name == name and cached_line.transport_type in valid_types:
-                    line_data = cached_line
-                    break
+            # 3. Búsqueda en Caché (O(1) por índice en lugar de recorrer todas las líneas)
+            line_data = lookup((type_str, name))
+            if line_data is None and fallback_type:
+                line_data = lookup((fallback_type, name))
             
             if line_data:
                 rich_lines.append({
@@ -264,28 +456,42 @@ class ServiceBase:
     async def get_station_by_code(self, station_code: str, transport_type: TransportType) -> Optional[Station]:
         start = time.perf_counter()
         
-        cache_key = f"all_stations_{transport_type.value}"
-        cached_list = await self.cache_service.get(cache_key)
-        
+        # Índice {code: Station} que se va rellenando con cada estación leída de la DB
+        # (sin alertas: se enriquece una copia en cada petición). sync_stations lo invalida
+        index_key = f"all_stations_{transport_type.value}__by_code"
+        stations_by_code = await self.cache_service.get(index_key)
+        cached_station = stations_by_code.get(str(station_code)) if stations_by_code else None
+
         station = None
 
-        if cached_list:
-            station = next((s for s in cached_list if str(s.code) == str(station_code)), None)
-            source = "CACHE_LIST"
+        if cached_station is not None:
+            source = "CACHE_INDEX"
+            alerts_map = await self._get_alerts_map(transport_type)
+            station = cached_station.model_copy()
+            self._enrich_with_alerts([station], alerts_map, key_attr="name")
         else:
             source = "DB_SINGLE_FETCH"
             
-            await self._ensure_lines_cache()
-            
-            db_station = await self.stations_repository.get_by_code(station_code, transport_type.value)
+            # Consultas independientes: las lanzamos a la vez
+            _, db_station, alerts_map = await asyncio.gather(
+                self._ensure_lines_cache(),
+                self.stations_repository.get_by_code(station_code, transport_type.value),
+                self._get_alerts_map(transport_type)
+            )
             
             if db_station:
-                station = self._map_physical_to_domain(db_station, transport_type)
-                alerts_map = await self._get_alerts_map(transport_type)
+                mapped = self._map_physical_to_domain(db_station, transport_type)
+                if stations_by_code is None:
+                    stations_by_code = {}
+                    await self.cache_service.set(index_key, stations_by_code, ttl=86400)
+                stations_by_code[str(station_code)] = mapped
+
+                station = mapped.model_copy()
                 self._enrich_with_alerts([station], alerts_map, key_attr="name")
 
-        elapsed = time.perf_counter() - start
-        logger.info(f"[{self.__class__.__name__}] get_station_by_code({station_code}) via {source} -> Found: {station is not None} ({elapsed:.4f}s)")
+        if logger.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - start
+            logger.debug(f"[{self.__class__.__name__}] get_station_by_code({station_code}) via {source} -> Found: {station is not None} ({elapsed:.4f}s)")
         
         return station
 
@@ -303,53 +509,63 @@ class ServiceBase:
                     phys_id = model.station.id 
                     
                     if phys_id not in unique_stations:
-                        mapped_item = self._map_route_stop_to_station_search_result(model)
-                        unique_stations[phys_id] = mapped_item
+                        unique_stations[phys_id] = self._map_route_stop_to_search_payload(model)
                 
-                return list(unique_stations.values())
-            
-            return [
-                self._map_route_stop_to_station_search_result(model) 
-                for model in route_stop_models
-            ]
+                payloads = list(unique_stations.values())
+            else:
+                payloads = [self._map_route_stop_to_search_payload(model) for model in route_stop_models]
 
-        all_stops = await self._get_from_cache_or_api(
-            cache_key=cache_key,
-            api_call=fetch_and_map,
-            cache_ttl=86400 
-        )
+            # Una sola llamada al validador de Pydantic para toda la lista
+            return _SEARCH_RESULTS_ADAPTER.validate_python(payloads)
+
+        # Copia local en memoria: evita el lock y la comprobación de caducidad de cache_service
+        mem_entry = self._mem_cache.get(cache_key)
+        if mem_entry and time.monotonic() - mem_entry[0] < self.SEARCH_MEM_CACHE_TTL:
+            all_stops = mem_entry[1]
+        else:
+            all_stops = await self._get_from_cache_or_api(
+                cache_key=cache_key,
+                api_call=fetch_and_map,
+                cache_ttl=86400 
+            )
+            if all_stops:
+                self._mem_cache[cache_key] = (time.monotonic(), all_stops)
 
         if not station_name:
             results = all_stops
         else:
-            results = self.fuzzy_search(
+            # CPU puro: lo sacamos del event loop para no bloquear otras peticiones
+            results = await asyncio.to_thread(
+                self.fuzzy_search,
                 query=station_name, 
                 items=all_stops, 
-                key=lambda s: s.station_name, 
+                search_index=self._get_search_index(cache_key, all_stops),
                 threshold=75
             )
 
-        elapsed = time.perf_counter() - start
-        logger.info(f"[{self.__class__.__name__}] get_stations_by_name('{station_name}') -> {len(results)} route_stops ({elapsed:.4f}s)")
+        if logger.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - start
+            logger.debug(f"[{self.__class__.__name__}] get_stations_by_name('{station_name}') -> {len(results)} route_stops ({elapsed:.4f}s)")
             
         return results
 
     async def get_nearby_stations(self, lat: float, lon: float, radius: float, transport_type: TransportType = None, limit: int = 50) -> List[NearbyStation]:
         start = time.perf_counter()
         
-        db_results = await self.stations_repository.get_nearby(
-            lat=lat, 
-            lon=lon, 
-            radius_km=radius, 
-            transport_type=transport_type,
-            limit=limit
+        db_results, _ = await asyncio.gather(
+            self.stations_repository.get_nearby(
+                lat=lat, 
+                lon=lon, 
+                radius_km=radius, 
+                transport_type=transport_type,
+                limit=limit
+            ),
+            self._ensure_lines_cache()
         )
 
         if not db_results:
             return []
 
-        await self._ensure_lines_cache()
-
         final_results = []
         for db_obj, distance in db_results:            
             nearby = NearbyStation(
@@ -367,31 +583,46 @@ class ServiceBase:
             
             final_results.append(nearby)
 
-        elapsed = time.perf_counter() - start
-        logger.info(f"[{self.__class__.__name__}] Nearby sync found {len(final_results)} in {elapsed:.4f}s")
+        if logger.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - start
+            logger.debug(f"[{self.__class__.__name__}] Nearby sync found {len(final_results)} in {elapsed:.4f}s")
         return final_results
     
     async def sync_lines(self, transport_type: TransportType):
         raw_lines = await self.fetch_lines()
         logger.info(f"⏳ {len(raw_lines)} {transport_type.value} lines to be sync in DB.")
 
-        VALID_COLS = {
-            'id', 'original_id', 'code', 'name', 'description',
-            'latitude', 'longitude', 'transport_type', 'stations',
-            'destination', 'origin', 'color', 'extra_data', 'has_alerts', 'alerts', 'name_with_emoji'
-        }
+        # TRAM: el origen/destino sale de las paradas de cada línea.
+        # Las pedimos todas en paralelo (acotado) antes de transformar.
+        stops_map = {}
+        if transport_type == TransportType.TRAM:
+            semaphore = asyncio.Semaphore(16)
+
+            async def fetch_line_stops(line_id: str) -> List[Station]:
+                async with semaphore:
+                    return await self.fetch_stations_by_line(line_id)
+
+            line_ids = [raw.id for raw in raw_lines]
+            results = await asyncio.gather(*[fetch_line_stops(line_id) for line_id in line_ids], return_exceptions=True)
 
-        async def transform_line(raw: Line) -> DBLine:
+            # Un fallo en una línea no tumba el resto: esa línea conserva el origen/destino de la API
+            for line_id, line_stops in zip(line_ids, results):
+                if isinstance(line_stops, Exception):
+                    logger.warning(f"⚠️ No se pudieron obtener las paradas de la línea {line_id}: {line_stops}")
+                    continue
+                stops_map[line_id] = line_stops
+
+        def transform_line(raw: Line) -> DBLine:
             db_id = f"{transport_type.value}-{raw.code}"
             
             if transport_type == TransportType.TRAM:
-                line_stops = await self.fetch_stations_by_line(raw.id)
+                line_stops = stops_map.get(raw.id)
                 if line_stops:
                     raw.origin = line_stops[0].name
                     raw.destination = line_stops[-1].name
                     raw.description = f"{line_stops[0].name} - {line_stops[-1].name}"
 
-            extra = self._extract_extra_data(raw, VALID_COLS)
+            extra = self._extract_extra_data(raw, _LINE_COLUMN_FIELDS)
             
             return DBLine(
                 id=db_id,
@@ -407,6 +638,8 @@ class ServiceBase:
             )
 
         await self._sync_batch(raw_lines, transform_line, self.line_repository, f"{transport_type.value} lines")
+        await self.cache_service.delete(f"lines_enriched_{transport_type.value}")
+        await self.cache_service.delete(f"lines_by_id_{transport_type.value}")
 
     async def sync_stations(self, transport_type: TransportType, lines_map: dict = None):
         raw_stations = await self.fetch_stations()
@@ -429,42 +662,29 @@ class ServiceBase:
         stops_by_line = defaultdict(list)
         dedup_lookup = {} 
 
-        excluded_fields = {
-            'id', 'original_id', 'code', 'name', 
-            'lat', 'latitude', 'lon', 'longitude', 
-            'description', 'municipality', 
-            'transport_type', 'type', 
-            'line_code', 'line_name', 'order', 'direction', 
-            'is_night'
-        }
+        t_type_str = transport_type.value if hasattr(transport_type, 'value') else str(transport_type)
+        id_prefix = 'bus' if t_type_str == 'nitbus' else t_type_str
 
-        for raw in raw_stations:
+        # Claves de coordenadas como enteros (grados * 1e5) calculadas de una vez con NumPy
+        station_count = len(raw_stations)
+        lats = np.fromiter((r.latitude for r in raw_stations), dtype=np.float64, count=station_count)
+        lons = np.fromiter((r.longitude for r in raw_stations), dtype=np.float64, count=station_count)
+        lat_keys = np.rint(lats * 1e5).astype(np.int64).tolist()
+        lon_keys = np.rint(lons * 1e5).astype(np.int64).tolist()
+
+        for i, raw in enumerate(raw_stations):
             # 1. Extracción y Limpieza
-            extra = self._extract_extra_data(raw, excluded_fields)
-            
-            t_type_str = transport_type.value if hasattr(transport_type, 'value') else str(transport_type)
-            
-            if extra:
-                for k, v in extra.items():
-                    if isinstance(v, TransportType):
-                        extra[k] = v.value
+            extra = self._extract_extra_data(raw, _STATION_COLUMN_FIELDS)
 
             # 2. Gestión del Group Code
-            group_code = None
-            if extra and 'station_group_code' in extra:
-                group_code = extra['station_group_code']
-                extra.pop('station_group_code', None)
+            group_code = extra.pop('station_group_code', None) if extra else None
 
             # 3. Lógica de Deduplicación
-            clean_id = None
-            
-            if group_code:
-                group_key = f"group-{group_code}"
-                if group_key in dedup_lookup:
-                    clean_id = dedup_lookup[group_key]
+            # Claves calculadas una sola vez: se usan tanto para buscar como para registrar
+            group_key = f"group-{group_code}" if group_code else None
+            coord_key = (lat_keys[i], lon_keys[i])
 
-            if not clean_id:
-                clean_id = dedup_lookup.get((round(raw.latitude, 5), round(raw.longitude, 5)))
+            clean_id = (dedup_lookup.get(group_key) if group_key else None) or dedup_lookup.get(coord_key)
 
             if not clean_id:
                 try:
@@ -472,13 +692,11 @@ class ServiceBase:
                 except (ValueError, TypeError):
                     number_part = str(raw.id)
 
-                prefix = t_type_str
-                if prefix == 'nitbus': prefix = 'bus'
-                clean_id = f"{prefix}-{number_part}"
+                clean_id = f"{id_prefix}-{number_part}"
                 
-                if group_code:
-                    dedup_lookup[f"group-{group_code}"] = clean_id
-                dedup_lookup[(round(raw.latitude, 5), round(raw.longitude, 5))] = clean_id
+                if group_key:
+                    dedup_lookup[group_key] = clean_id
+                dedup_lookup[coord_key] = clean_id
 
             # 4. Construcción del Objeto Estación Física
             if clean_id not in physical_stations_map:
@@ -491,7 +709,7 @@ class ServiceBase:
                     "lon": raw.longitude,
                     "transport_type": t_type_str,
                     "extra_data": extra,
-                    "lines_set": set()
+                    "lines_set": []
                 }
             
             # --- 5. Resolución de NOMBRE y COLOR ---
@@ -522,8 +740,12 @@ class ServiceBase:
                 if hasattr(raw, 'color') and raw.color:
                     final_color = raw.color
             
-            # IMPORTANTE: Guardamos una TUPLA (nombre, color) en el set para que sea única
-            physical_stations_map[clean_id]["lines_set"].add((final_name, final_id, final_color))
+            # IMPORTANTE: Guardamos una TUPLA (nombre, id, color) sin repetir.
+            # Una estación tiene pocas líneas, así que una lista pequeña es más barata que un set.
+            line_entry = (final_name, final_id, final_color)
+            station_lines = physical_stations_map[clean_id]["lines_set"]
+            if line_entry not in station_lines:
+                station_lines.append(line_entry)
 
             # 6. Preparación de Route Stops
             direction = getattr(raw, 'direction', 'única')
@@ -531,88 +753,104 @@ class ServiceBase:
 
         # --- FASE 2: Lógica de Ruta ---
         
-        route_stops_buffer = []
+        route_stops_records = []
 
         for (line_id, direction), stops_tuples in stops_by_line.items():
             sorted_tuples = sorted(stops_tuples, key=lambda x: x[0].order)
             total_stops = len(sorted_tuples)
             
             for index, (stop, s_clean_id, s_group_code) in enumerate(sorted_tuples):
-                route_stops_buffer.append(DBRouteStop(
-                    line_id=line_id,
-                    physical_station_id=s_clean_id,
-                    station_external_code=str(stop.code) if stop.code else "",
-                    station_group_code=str(s_group_code) if s_group_code else None,
-                    order=stop.order,
-                    direction=direction,
-                    is_origin=(index == 0),
-                    is_destination=(index == total_stops - 1)
+                # Mismo orden que ROUTE_STOP_COPY_COLUMNS
+                route_stops_records.append((
+                    line_id,
+                    s_clean_id,
+                    str(stop.code) if stop.code else "",
+                    str(s_group_code) if s_group_code else None,
+                    stop.order,
+                    direction,
+                    index == 0,
+                    index == total_stops - 1
                 ))
 
-        # --- FASE 3: Persistencia Robusta ---
-        
+        # --- FASE 3: Persistencia Robusta (COPY) ---
+        # Cada route stop apunta a una estación física, así que sin estaciones no hay nada que guardar
+        if not physical_stations_map:
+            return
+
+        updated_at = datetime.utcnow()
+        stations_records = []
+        for p_data in physical_stations_map.values():
+            
+            # TRANSFORMACIÓN FINAL: Lista de Tuplas -> Lista de Diccionarios
+            # Ordenamos por nombre (x[0]) para que el JSON sea consistente
+            lines_summary_json = [
+                {"name": name, "id": id, "color": color}
+                for name, id, color in sorted(p_data["lines_set"], key=lambda x: x[0])
+            ]
+
+            # Mismo orden que PHYSICAL_STATION_COPY_COLUMNS. COPY espera el JSON serializado.
+            stations_records.append((
+                p_data["id"],
+                p_data["name"],
+                p_data["description"],
+                p_data["transport_type"],
+                p_data["lat"],
+                p_data["lon"],
+                p_data["municipality"],
+                json.dumps(p_data["extra_data"]),
+                json.dumps(lines_summary_json),
+                updated_at
+            ))
+
         async with async_session_factory() as session:
             try:
+                # La tabla temporal abre la transacción; el COPY usa la misma conexión asyncpg
+                await session.execute(text(
+                    "CREATE TEMP TABLE staging_physical_stations "
+                    "(LIKE physical_stations INCLUDING DEFAULTS) ON COMMIT DROP"
+                ))
+                sa_conn = await session.connection()
+                raw_conn = await sa_conn.get_raw_connection()
+                driver_conn = raw_conn.driver_connection
+
                 # 3.1 Guardar Estaciones Físicas
-                if physical_stations_map:
-                    stations_data = []
-                    for p_data in physical_stations_map.values():
-                        
-                        # TRANSFORMACIÓN FINAL: Set de Tuplas -> Lista de Diccionarios
-                        # Ordenamos por nombre (x[0]) para que el JSON sea consistente
-                        lines_summary_json = [
-                            {"name": name, "id": id, "color": color}
-                            for name, id, color in sorted(list(p_data["lines_set"]), key=lambda x: x[0])
-                        ]
-
-                        stations_data.append({
-                            "id": p_data["id"],
-                            "name": p_data["name"],
-                            "description": p_data["description"],
-                            "latitude": p_data["lat"],
-                            "longitude": p_data["lon"],
-                            "municipality": p_data["municipality"],
-                            "transport_type": p_data["transport_type"],
-                            "extra_data": p_data["extra_data"],
-                            
-                            # Aquí guardamos la estructura rica con color
-                            "lines_summary": lines_summary_json,
-                            
-                            "updated_at": datetime.utcnow()
-                        })
-
-                    logger.info(f"📍 Upserting {len(stations_data)} physical stations...")
-                    BATCH_SIZE = 1000 
-                    
-                    for i in range(0, len(stations_data), BATCH_SIZE):
-                        chunk = stations_data[i : i + BATCH_SIZE]
-                        
-                        stmt = pg_insert(DBPhysicalStation).values(chunk)
-                        stmt = stmt.on_conflict_do_update(
-                            index_elements=['id'], 
-                            set_={
-                                "name": stmt.excluded.name,
-                                "lines_summary": stmt.excluded.lines_summary,
-                                "extra_data": stmt.excluded.extra_data,
-                                "updated_at": stmt.excluded.updated_at
-                            }
-                        )
-                        await session.execute(stmt)
-                    
-                    await session.flush()
+                logger.info(f"📍 Upserting {len(stations_records)} physical stations...")
+                await driver_conn.copy_records_to_table(
+                    "staging_physical_stations",
+                    records=stations_records,
+                    columns=PHYSICAL_STATION_COPY_COLUMNS
+                )
+
+                columns_sql = ", ".join(PHYSICAL_STATION_COPY_COLUMNS)
+                await session.execute(text(
+                    f"INSERT INTO physical_stations ({columns_sql}) "
+                    f"SELECT {columns_sql} FROM staging_physical_stations "
+                    "ON CONFLICT (id) DO UPDATE SET "
+                    "name = EXCLUDED.name, "
+                    "lines_summary = EXCLUDED.lines_summary, "
+                    "extra_data = EXCLUDED.extra_data, "
+                    "updated_at = EXCLUDED.updated_at"
+                ))
 
                 # 3.2 Guardar Route Stops
-                if route_stops_buffer:
-                    logger.info(f"🚏 Inserting {len(route_stops_buffer)} route stops...")
-                    BATCH_SIZE_STOPS = 2000
-                    for i in range(0, len(route_stops_buffer), BATCH_SIZE_STOPS):
-                        chunk_stops = route_stops_buffer[i : i + BATCH_SIZE_STOPS]
-                        session.add_all(chunk_stops)
-                        await session.flush() 
+                if route_stops_records:
+                    logger.info(f"🚏 Inserting {len(route_stops_records)} route stops...")
+                    await driver_conn.copy_records_to_table(
+                        "route_stops",
+                        records=route_stops_records,
+                        columns=ROUTE_STOP_COPY_COLUMNS
+                    )
                 
                 await session.commit()
                 logger.info(f"✅ {transport_type.value} Sync completed successfully.")
 
+                # Las búsquedas por nombre deben ver las paradas recién sincronizadas
+                search_key = f"searchable_route_stops_{transport_type.value}"
+                self._mem_cache.pop(search_key, None)
+                if self.cache_service:
+                    await self.cache_service.delete(search_key)
+                    await self.cache_service.delete(f"all_stations_{transport_type.value}__by_code")
+
             except Exception as e:
                 logger.error(f"❌ Error syncing stations: {e}")
                 await session.rollback()
@@ -636,30 +874,57 @@ class ServiceBase:
             )
     
         await self._sync_batch(raw_alerts, transform_alert, self.alerts_repository, f"{transport_type.value} alerts")
+        await self.cache_service.delete(f"lines_enriched_{transport_type.value}")
+        await self.cache_service.delete(f"{transport_type.value}_alerts_map_db")
+        ServiceBase._alert_keys_cache.clear()
+        ServiceBase._alert_station_names_cache.clear()
+        self._alerts_inflight.pop(transport_type, None)
 
     async def _sync_batch(self, raw_items: List[Any], transform_func: Callable[[Any], Any], repository: Any, label: str):
         batch_size = 500
-        current_batch = []
+        # Lotes en vuelo a la vez (cada upsert abre su propia sesión del pool)
+        upsert_semaphore = asyncio.Semaphore(4)
+        # Transformaciones asíncronas en vuelo a la vez dentro de cada lote
+        transform_semaphore = asyncio.Semaphore(16)
+        is_async = asyncio.iscoroutinefunction(transform_func)
+        upsert_tasks = []
         count = 0
+        saved_batches = 0
         total = len(raw_items)
 
-        for raw in raw_items:
-            if asyncio.iscoroutinefunction(transform_func):
-                model = await transform_func(raw)
-            else:
-                model = transform_func(raw)
-                
-            current_batch.append(model)
-
-            if len(current_batch) >= batch_size:
-                await self._safe_upsert(repository, current_batch, label)
-                count += len(current_batch)
+        async def transform(raw: Any):
+            async with transform_semaphore:
+                return await transform_func(raw)
+
+        async def upsert(batch: List[Any]):
+            nonlocal count, saved_batches
+            async with upsert_semaphore:
+                await self._safe_upsert(repository, batch, label)
+            count += len(batch)
+            saved_batches += 1
+            # Progreso cada 10 lotes (y al terminar), no una línea por lote
+            if saved_batches % 10 == 0 or count == total:
                 logger.info(f"   ↳ Guardadas {count}/{total} {label}...")
-                current_batch = []
 
-        if current_batch:
-            await self._safe_upsert(repository, current_batch, label)
-            count += len(current_batch)
+        try:
+            for start in range(0, total, batch_size):
+                chunk = raw_items[start:start + batch_size]
+                if is_async:
+                    batch = list(await asyncio.gather(*[transform(raw) for raw in chunk]))
+                else:
+                    batch = [transform_func(raw) for raw in chunk]
+
+                # Lanzamos el lote y seguimos transformando el siguiente mientras se guarda
+                upsert_tasks.append(asyncio.create_task(upsert(batch)))
+        except BaseException:
+            # Si falla una transformación no dejamos lotes escribiendo en la DB a espaldas del llamador
+            for task in upsert_tasks:
+                task.cancel()
+            await asyncio.gather(*upsert_tasks, return_exceptions=True)
+            raise
+
+        if upsert_tasks:
+            await asyncio.gather(*upsert_tasks)
 
         logger.info(f"✅ Sync finalizada: {count} {label} en DB.")
 
@@ -669,66 +934,77 @@ class ServiceBase:
         except Exception as e:
             logger.error(f"❌ Error guardando lote de {label}: {e}")
 
-    def _extract_extra_data(self, obj: Any, valid_columns: Set[str]) -> Dict:
-        return {
-            key: value 
-            for key, value in obj.model_dump().items() 
-            if key not in valid_columns and value is not None
-        }
+    def _extract_extra_data(self, obj: Any, valid_columns: FrozenSet[str]) -> Dict:
+        # Leemos los atributos directamente: model_dump serializaría todos los campos para descartar la mayoría
+        extra = {}
+        for key, value in obj.__dict__.items():
+            if key in valid_columns or value is None:
+                continue
+            if isinstance(value, Enum):
+                # extra_data se guarda como JSON: los enums (TransportType...) van por su valor
+                value = value.value
+            elif isinstance(value, (BaseModel, list)) or is_dataclass(value):
+                # Solo los valores anidados pasan por Pydantic (respeta los field_serializer del modelo)
+                value = obj.model_dump(include={key})[key]
+            extra[key] = value
+        return extra
+
+    def _enrich_with_alerts(self, items: List[Any], alerts_map: Dict[str, Tuple[Alert, ...]], key_attr: str = "name"):
+        # Las claves de alerts_map ya vienen normalizadas (strip().upper()) desde _get_alerts_map,
+        # y las estaciones de cada alerta se calculan al construir el mapa (ver _alert_station_names).
+        # Cada lista del mapa ya tiene ids únicos (claves en frozenset), así que solo deduplicamos
+        # cuando se añaden las alertas de la línea.
+        get_key = attrgetter(key_attr)
+        for item in items:
+            search_key = get_key(item).strip().upper()
+            item_alerts = list(alerts_map.get(search_key, ()))
 
-    def _enrich_with_alerts(self, items: List[Any], alerts_map: Dict[str, List[Alert]], key_attr: str = "name"):
-    
-        normalized_map = {}
-        for key, alerts in alerts_map.items():
-            norm_key = key.strip().upper()
-            if norm_key not in normalized_map:
-                normalized_map[norm_key] = []
-            normalized_map[norm_key].extend(alerts)
+            line_name = getattr(item, 'line_name', None)
+            if line_name:
+                search_line_key = line_name.strip().upper()
+                line_alerts = alerts_map.get(search_line_key) if search_line_key != search_key else None
 
-        for item in items:
-            item_alerts = []
-            seen_ids = set()
-            
-            raw_key = getattr(item, key_attr, "")
-            search_key = raw_key.strip().upper()
-            
-            if search_key in normalized_map:
-                for alert in normalized_map[search_key]:
-                    if alert.id not in seen_ids:
-                        item_alerts.append(alert)
-                        seen_ids.add(alert.id)
-            
-            is_station = hasattr(item, 'line_name') and item.line_name
-            
-            if is_station:
-                raw_line_key = item.line_name
-                search_line_key = raw_line_key.strip().upper()
-                
-                if search_line_key != search_key and search_line_key in normalized_map:
-                    
-                    for alert in normalized_map[search_line_key]:
+                if line_alerts:
+                    item_name_norm = item.name.strip().upper()
+                    seen_ids = {alert.id for alert in item_alerts}
+
+                    for alert in line_alerts:
                         if alert.id in seen_ids:
                             continue
 
-                        targets_specific_stations = any(e.get("station_name") for e in alert.affected_entities)
-                        
-                        item_name_norm = item.name.strip().upper()
-                        
-                        targets_me = any(
-                            (e.get("station_name") or "").strip().upper() == item_name_norm 
-                            for e in alert.affected_entities
-                        )
-
-                        if targets_specific_stations and not targets_me:
+                        station_names = self._alert_station_names(alert)
+                        if station_names and item_name_norm not in station_names:
                             continue
 
                         item_alerts.append(alert)
                         seen_ids.add(alert.id)
 
             item.alerts = item_alerts
-            item.has_alerts = len(item_alerts) > 0
-
-    async def _get_alerts_map(self, transport_type: TransportType) -> Dict[str, List[Alert]]:
+            item.has_alerts = bool(item_alerts)
+
+    @classmethod
+    def _alert_station_names(cls, alert: Alert) -> FrozenSet[str]:
+        """Estaciones concretas a las que apunta la alerta (vacío = afecta a toda la línea)."""
+        station_names = cls._alert_station_names_cache.get(alert.id)
+        if station_names is None:
+            station_names = frozenset(
+                e.get("station_name").strip().upper()
+                for e in alert.affected_entities or []
+                if e.get("station_name")
+            )
+            cls._alert_station_names_cache[alert.id] = station_names
+        return station_names
+
+    async def _get_alerts_map(self, transport_type: TransportType) -> Dict[str, Tuple[Alert, ...]]:
+        # Las llamadas concurrentes o muy seguidas comparten la misma tarea en vez de repetir la consulta
+        task = self._alerts_inflight.get(transport_type)
+        if task is None or time.monotonic() - self._alerts_ts.get(transport_type, 0) >= self.ALERTS_MAP_MEMO_TTL:
+            task = asyncio.create_task(self._fetch_alerts_map_impl(transport_type))
+            self._alerts_inflight[transport_type] = task
+            self._alerts_ts[transport_type] = time.monotonic()
+        return await asyncio.shield(task)
+
+    async def _fetch_alerts_map_impl(self, transport_type: TransportType) -> Dict[str, Tuple[Alert, ...]]:
         cache_key = f"{transport_type.value}_alerts_map_db"
         cached = await self.cache_service.get(cache_key)
         if cached: 
@@ -740,8 +1016,9 @@ class ServiceBase:
             if not db_alerts:
                 return {}
 
-            result = defaultdict(list)
-            
+            # 1ª pasada: construimos las alertas y sus claves
+            keyed_alerts = []
+            all_keys = set()
             for alert_model in db_alerts:
                 alert = Alert(
                     id=alert_model.id,
@@ -754,46 +1031,58 @@ class ServiceBase:
                     affected_entities=alert_model.affected_entities
                 )
                 
-                entities = alert.affected_entities or []                
-                mapped_keys = set()
-
-                for entity in entities:
-                    station_name = entity.get("station_name")
-                    if station_name:
-                        k = station_name.strip().upper()
-                        if k not in mapped_keys:
-                            result[k].append(alert)
-                            mapped_keys.add(k)
-                            
-                    line_name = entity.get("line_name")
-                    if line_name:
-                        k = line_name.strip().upper()
-                        if k not in mapped_keys:
-                            result[k].append(alert)
-                            mapped_keys.add(k)
-
-            alerts_dict = dict(result)
+                mapped_keys = self._alert_keys_cache.get(alert_model.id)
+                if mapped_keys is None:
+                    mapped_keys = self._extract_alert_keys(alert.affected_entities)
+                    self._alert_keys_cache[alert_model.id] = mapped_keys
+
+                # Se precalcula aquí para que _enrich_with_alerts no recorra las entidades en cada petición
+                self._alert_station_names(alert)
+
+                keyed_alerts.append((mapped_keys, alert))
+                all_keys.update(mapped_keys)
+
+            # 2ª pasada: agrupamos sobre un dict ya dimensionado (sin defaultdict)
+            alerts_dict = {k: [] for k in all_keys}
+            for mapped_keys, alert in keyed_alerts:
+                for k in mapped_keys:
+                    alerts_dict[k].append(alert)
+
+            # El mapa se comparte entre peticiones (caché + memo de 30s): lo congelamos en tuplas
+            alerts_dict = {k: tuple(v) for k, v in alerts_dict.items()}
 
             await self.cache_service.set(cache_key, alerts_dict, ttl=300)
             return alerts_dict
 
         except Exception as e:
             logger.error(f"Error building alerts map from DB: {e}", exc_info=True) # exc_info ayuda a ver el traceback completo
+            # Un fallo puntual no se memoriza: la siguiente llamada vuelve a consultar
+            if self._alerts_inflight.get(transport_type) is asyncio.current_task():
+                del self._alerts_inflight[transport_type]
             return {}
 
+    @staticmethod
+    def _extract_alert_keys(entities: Optional[List[dict]]) -> FrozenSet[str]:
+        return frozenset(
+            name.strip().upper()
+            for entity in entities or []
+            for name in (entity.get("station_name"), entity.get("line_name"))
+            if name
+        )
+
     async def _get_from_cache_or_api(self, cache_key: str, api_call: Callable[[], Any], cache_ttl: int = 3600) -> Any:
         class_name = self.__class__.__name__
 
         if self.cache_service:
             cached_data = await self.cache_service.get(cache_key)
             if cached_data:
-                logger.debug(f"[{class_name}] Cache hit: {cache_key}")
+                logger.debug("[%s] Cache hit: %s", class_name, cache_key)
                 return cached_data
-            logger.debug(f"[{class_name}] Cache miss: {cache_key}")
+            logger.debug("[%s] Cache miss: %s", class_name, cache_key)
 
         try:
             data = await api_call()
-            logger.debug(f"[{class_name}] Fetched data from API for key: {cache_key}")
+            logger.debug("[%s] Fetched data from API for key: %s", class_name, cache_key)
         except Exception as e:
             logger.error(f"[{class_name}] Error fetching data for key {cache_key}: {e}")
             return []
@@ -803,41 +1092,6 @@ class ServiceBase:
         
         return data
     
-    async def _get_from_cache_or_data(self, cache_key: str, data: Any, cache_ttl: int = 3600) -> Any:
-        if self.cache_service:
-            cached_data = await self.cache_service.get(cache_key)
-            if cached_data: return cached_data
-            
-        if self.cache_service and data is not None:
-             await self.cache_service.set(cache_key, data, ttl=cache_ttl)
-             
-        return data
-
-    def _map_db_to_domain(self, model) -> Station:
-        st = Station.model_validate(model)
-
-        if model.line:
-            st.line_name = model.line.name
-            st.line_code = model.line.code
-
-        if model.extra_data:
-            if not st.line_name: st.line_name = model.extra_data.get('line_name')
-            if not st.line_code: st.line_code = model.extra_data.get('line_code')
-            if not st.moute_id: st.moute_id = model.extra_data.get('moute_id')
-            if not st.outbound_code: st.outbound_code = model.extra_data.get('outbound_code')
-            if not st.return_code: st.return_code = model.extra_data.get('return_code')
-            if not st.station_group_code: st.station_group_code = model.extra_data.get('station_group_code')
-            if not st.direction: st.direction = model.extra_data.get('direction')
-
-        if model.connections_data and not st.connections:
-            try:
-                from src.domain.models.common.connections import Connections
-                st.connections = Connections.model_validate(model.connections_data)
-            except Exception as e:
-                logger.warning(f"Error parsing connections for {st.code}: {e}")
-            
-        return st
-    
     def _map_physical_to_domain(self, physical: DBPhysicalStation, t_type: TransportType) -> Station:
         extra = physical.extra_data or {}
         
@@ -849,52 +1103,46 @@ class ServiceBase:
             station_transport_type=t_type
         )
 
-        return Station(
+        # Los datos vienen de nuestra DB, así que evitamos la validación de Pydantic
+        return Station.model_construct(
+            **_EMPTY_STATION_DEFAULTS,
             id=physical.id,
-            original_id=physical.id.split('-')[-1] if '-' in physical.id else physical.id,
-            code="",
+            original_id=physical.original_id,
             name=physical.name,
             latitude=physical.latitude,
             longitude=physical.longitude,
             description=physical.description,
             transport_type=t_type,
-            
-            # Campos de Ruta: Al ser búsqueda global, no aplican
-            order=0, 
-            line_code=None,
-            line_name=None,
-            direction=None,
-            is_origin=False,
-            is_destination=False,
 
             # Campos Extra
             station_group_code=int(extra.get('station_group_code')) if extra.get('station_group_code') else None,
             moute_id=str(extra.get('moute_id')) if extra.get('moute_id') else None,
             
-            has_alerts=False,
             alerts=[],
-            connections=rich_connections
+            connections=Connections.model_validate(rich_connections) if rich_connections else None
         )
-    def _map_route_stop_to_station_search_result(self, db_stop: DBRouteStop) -> StationSearchResult:    
+
+    def _map_route_stop_to_search_payload(self, db_stop: DBRouteStop) -> Dict[str, Any]:
+        # Datos en bruto de StationSearchResult; se validan en bloque con _SEARCH_RESULTS_ADAPTER
         phys = db_stop.station  
         line = db_stop.line
 
-        return StationSearchResult(
-            physical_station_id=phys.id,
-            station_external_code=db_stop.station_external_code,
-            line_id=line.id,
+        return {
+            "physical_station_id": phys.id,
+            "station_external_code": db_stop.station_external_code,
+            "line_id": line.id,
             
-            station_name=phys.name,
-            line_name=line.name,
-            line_color=line.color or "#000000",
-            line_destination=line.destination,
+            "station_name": phys.name,
+            "line_name": line.name,
+            "line_color": line.color or "#000000",
+            "line_destination": line.destination,
             
-            type=phys.transport_type,
-            match_score=0.0,
+            "type": phys.transport_type,
+            "match_score": 0.0,
             
-            coordinates=(phys.latitude, phys.longitude),
-            has_alerts=False
-        )
+            "coordinates": (phys.latitude, phys.longitude),
+            "has_alerts": False
+        }
 
     @abstractmethod
     async def fetch_alerts(self) -> List[Alert]: pass
@@ -908,8 +1156,14 @@ class ServiceBase:
     @abstractmethod
     async def fetch_stations_by_line(self, line_id: str) -> List[Station]: pass
 
+    @staticmethod
     def log_exec_time(func):
+        @wraps(func)
         async def wrapper(*args, **kwargs):
+            # En producción (INFO) no medimos ni formateamos nada
+            if not logger.isEnabledFor(logging.DEBUG):
+                return await func(*args, **kwargs)
+
             start = time.perf_counter()
             result = await func(*args, **kwargs)
             elapsed = (time.perf_counter() - start) * 1000
@@ -918,47 +1172,144 @@ class ServiceBase:
             return result
         return wrapper
 
-    def fuzzy_search(self, query: str, items: List[StationSearchResult], key: Callable[[Any], str], threshold: float = 75) -> List[StationSearchResult]:
+    @classmethod
+    def fuzzy_search(cls, query: str, items: List[StationSearchResult], key: Optional[Callable[[Any], str]] = None, threshold: float = 75, limit: int = 20, search_index: Optional[SearchIndex] = None, scorer: Optional[Callable[..., float]] = None) -> List[StationSearchResult]:
+        # `search_index` trae los nombres ya extraídos, unidos y preprocesados, alineados con `items`
+        if search_index is not None:
+            choices = search_index.names
+            unique_processed = search_index.unique_processed
+            name_slot = search_index.name_slot
+        else:
+            choices = [key(item) for item in items]
+            choices_lower = [name.lower() for name in choices]
+            # Sin índice normalizamos/preprocesamos solo lo que llegue a cada pasada
+            unique_processed = name_slot = None
+
         query_lower = query.lower()
         query_norm = HtmlHelper.normalize_text(query_lower)
 
         # 1. Exact Matches (Puntuación máxima)
-        exact_matches = []
-        for item in items:
-            if query_lower in key(item).lower():
-                item.match_score = 100.0
-                exact_matches.append(item)
+        # Con índice buscamos sobre todos los nombres unidos; con suficientes coincidencias
+        # no hace falta seguir, normalizar ni puntuar
+        if search_index is not None:
+            exact_hits = _substring_hits(query_lower, search_index.lower_blob, search_index.lower_starts)
+        else:
+            exact_hits = (i for i, name_lower in enumerate(choices_lower) if query_lower in name_lower)
+        exact_idx = list(islice(exact_hits, limit))
+        exact_matches = [cls._scored(items[i], 100.0) for i in exact_idx]
+        if len(exact_matches) >= limit:
+            return exact_matches
 
         # 2. Normalized Matches (Puntuación alta, pero menor que exacta)
-        # Excluimos lo que ya encontramos en exact_matches
-        remaining_after_exact = [item for item in items if item not in exact_matches]
-        normalized_matches = []
-        for item in remaining_after_exact:
-            if query_norm in HtmlHelper.normalize_text(key(item).lower()):
-                item.match_score = 95.0
-                normalized_matches.append(item)
+        matched = set(exact_idx)
+        if search_index is not None:
+            norm_hits = (
+                i for i in _substring_hits(query_norm, search_index.normalized_blob, search_index.normalized_starts)
+                if i not in matched
+            )
+        else:
+            norm_hits = (
+                i for i in range(len(items))
+                if i not in matched and query_norm in HtmlHelper.normalize_text(choices_lower[i])
+            )
+        normalized_idx = list(islice(norm_hits, limit - len(exact_matches)))
+        normalized_matches = [cls._scored(items[i], 95.0) for i in normalized_idx]
+        if len(exact_matches) + len(normalized_matches) >= limit:
+            return exact_matches + normalized_matches
+
+        matched.update(normalized_idx)
+        unmatched_idx = [i for i in range(len(items)) if i not in matched]
 
-        # 3. Fuzzy Matches (Puntuación real de la librería)
-        # Solo procesamos lo que no ha coincidido con los métodos anteriores
         all_found = exact_matches + normalized_matches
-        remaining_items = [item for item in items if item not in all_found]
-        
-        # Creamos un mapa para recuperar el objeto por su nombre/key
-        item_dict = {key(item): item for item in remaining_items}
-        
-        fuzzy_results = process.extract(
-            query=query,
-            choices=item_dict.keys(),
-            scorer=fuzz.WRatio,
-            limit=20 # Limitamos para no procesar miles de resultados irrelevantes
-        )
 
-        fuzzy_filtered = []
-        for name, score, _ in fuzzy_results:
-            if score >= threshold:
-                item = item_dict[name]
-                item.match_score = float(score)
-                fuzzy_filtered.append(item)
+        # 3. Fuzzy Matches (Puntuación real de la librería)
+        # Solo procesamos lo que no ha coincidido con los métodos anteriores.
+        # cdist puntúa todos los candidatos de golpe en C++ (sin GIL) y nos da un score por índice
+        if not unmatched_idx:
+            return all_found
+
+        # Los candidatos ya están preprocesados: solo procesamos la consulta y desactivamos el processor.
+        # Con índice, una estación que aparece en varias líneas se puntúa una sola vez y se reparte el score
+        if name_slot is not None:
+            slots = name_slot[unmatched_idx]
+            needed = np.unique(slots)
+            candidates = [unique_processed[j] for j in needed.tolist()]
+        else:
+            candidates = [utils.default_process(choices[i]) for i in unmatched_idx]
+
+        scores = process.cdist(
+            [utils.default_process(query)],
+            candidates,
+            scorer=scorer or cls.FUZZY_SCORER,
+            processor=None,
+            score_cutoff=threshold,
+            workers=-1
+        )[0]
+
+        if name_slot is not None:
+            unique_scores = np.zeros(len(unique_processed), dtype=scores.dtype)
+            unique_scores[needed] = scores
+            scores = unique_scores[slots]
+
+        fuzzy_filtered = [
+            cls._scored(items[unmatched_idx[idx]], float(scores[idx]))
+            for idx in cls._top_hits(scores, threshold, limit - len(all_found)) # Solo los huecos que quedan libres
+        ]
 
         # Devolvemos todo combinado
-        return exact_matches + normalized_matches + fuzzy_filtered
\ No newline at end of file
+        return all_found + fuzzy_filtered
+
+    @staticmethod
+    def _scored(item: StationSearchResult, score: float) -> StationSearchResult:
+        # Copia con su puntuación: los items cacheados se comparten entre búsquedas concurrentes
+        return item.model_copy(update={"match_score": score})
+
+    def _get_search_index(self, cache_key: str, items: List[StationSearchResult]) -> SearchIndex:
+        """
+        Devuelve los nombres de `items` (original, minúsculas, normalizado y preprocesado para rapidfuzz)
+        alineados por índice, junto con los nombres preprocesados únicos para no puntuar dos veces
+        la misma estación cuando aparece en varias líneas, y los nombres unidos en un solo texto
+        para las pasadas de subcadena.
+        Se recalculan solo cuando la lista cacheada cambia (nuevo objeto tras expirar la caché).
+        """
+        cached = self._search_indexes.get(cache_key)
+        if cached and cached[0] is items:
+            return cached[1]
+
+        choices = [item.station_name for item in items]
+        choices_lower = [name.lower() for name in choices]
+
+        slot_by_name: Dict[str, int] = {}
+        name_slot = np.fromiter(
+            (slot_by_name.setdefault(utils.default_process(name), len(slot_by_name)) for name in choices),
+            dtype=np.intp,
+            count=len(choices)
+        )
+        lower_blob, lower_starts = _join_names(choices_lower)
+        normalized_blob, normalized_starts = _join_names([HtmlHelper.normalize_text(name) for name in choices_lower])
+        search_index = SearchIndex(
+            names=choices,
+            unique_processed=list(slot_by_name),
+            name_slot=name_slot,
+            lower_blob=lower_blob,
+            lower_starts=lower_starts,
+            normalized_blob=normalized_blob,
+            normalized_starts=normalized_starts
+        )
+        self._search_indexes[cache_key] = (items, search_index)
+        return search_index
+
+    @staticmethod
+    def _top_hits(scores: np.ndarray, threshold: float, limit: int) -> List[int]:
+        """
+        Índices de los `limit` mejores scores que alcanzan `threshold`, de mayor a menor.
+        Solo se ordenan los aciertos (normalmente unos pocos), no todos los candidatos;
+        entre los seleccionados, en empate se respeta el orden original (como process.extract).
+        """
+        if limit <= 0:
+            return []
+        hits = np.flatnonzero(scores >= threshold)
+        if hits.size > limit:
+            # Nos quedamos con los `limit` mejores sin ordenar el resto
+            hits = np.sort(hits[np.argpartition(-scores[hits], limit - 1)[:limit]])
+        return hits[np.argsort(-scores[hits], kind="stable")].tolist()
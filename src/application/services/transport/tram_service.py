@@ -1,4 +1,5 @@
 import asyncio
+import logging
 import time
 from typing import List, Optional
 
@@ -23,6 +24,8 @@ class TramService(ServiceBase):
     Optimizado para llamadas paralelas controladas.
     """
 
+    STOP_CODES_CACHE_KEY = "tram_stop_codes"
+
     def __init__(
         self,
         tram_api_service: TramApiService,
@@ -44,6 +47,8 @@ class TramService(ServiceBase):
 
     async def sync_stations(self, valid_lines_filter):
         await super().sync_stations(TransportType.TRAM, valid_lines_filter)
+        if self.cache_service:
+            await self.cache_service.delete(self.STOP_CODES_CACHE_KEY)
 
     async def sync_alerts(self):
         await super().sync_alerts(TransportType.TRAM)
@@ -59,7 +64,7 @@ class TramService(ServiceBase):
         semaphore = asyncio.Semaphore(5)
 
         async def fetch_line_stops(line):
-            line_id = getattr(line, 'original_id', None) or line.code
+            line_id = line.original_id or line.code
             async with semaphore:
                 try:
                     return await self.tram_api_service.get_stops_on_line(line_id)
@@ -112,19 +117,29 @@ class TramService(ServiceBase):
             logger.warning(f"⚠️ Metadata not found for line_id: {line_id}")
             return []
         
-        route_stop = await self.stations_repository.get_stop_by_physical_and_line_id(
-            physical_station_id, 
-            line_id
-        )
-
-        if not route_stop:
-            logger.warning(f"⚠️ Tram Stop not found for {physical_station_id} + {line_id}")
-            return []
-
-        station = route_stop.station
-        extra = station.extra_data or {}
-        outbound = extra.get('outbound_code')
-        inbound = extra.get('return_code')
+        # Los códigos de andén sólo cambian con sync_stations: se guardan en un índice
+        # {(estación, línea): (outbound, inbound)} para no releer la parada en cada petición
+        stop_codes = await self.cache_service.get(self.STOP_CODES_CACHE_KEY)
+        codes = stop_codes.get((physical_station_id, line_id)) if stop_codes else None
+
+        if codes is None:
+            route_stop = await self.stations_repository.get_stop_by_physical_and_line_id(
+                physical_station_id, 
+                line_id
+            )
+
+            if not route_stop:
+                logger.warning(f"⚠️ Tram Stop not found for {physical_station_id} + {line_id}")
+                return []
+
+            extra = route_stop.station.extra_data or {}
+            codes = (extra.get('outbound_code'), extra.get('return_code'))
+            if stop_codes is None:
+                stop_codes = {}
+                await self.cache_service.set(self.STOP_CODES_CACHE_KEY, stop_codes, ttl=86400)
+            stop_codes[(physical_station_id, line_id)] = codes
+
+        outbound, inbound = codes
 
         if not outbound and not inbound:
             return []
@@ -141,16 +156,15 @@ class TramService(ServiceBase):
             return []
 
         target_line_name = line_metadata.name.upper()
-        filtered_routes = []
+        line_color = line_metadata.color or "008E78"
+        filtered_routes = [route for route in all_routes if route.line_name.upper() == target_line_name]
 
-        for route in all_routes:
-            if route.line_name.upper() == target_line_name:
-                route.line_id = line_id
-                route.color = line_metadata.color or "008E78"
-                
-                filtered_routes.append(route)
+        for route in filtered_routes:
+            route.line_id = line_id
+            route.color = line_color
 
-        elapsed = time.perf_counter() - start
-        logger.info(f"[{self.__class__.__name__}] RT {line_id} @ {physical_station_id} -> {len(filtered_routes)} routes (taken from pool of {len(all_routes)}) ({elapsed:.4f}s)")
+        if logger.isEnabledFor(logging.DEBUG):
+            elapsed = time.perf_counter() - start
+            logger.debug(f"[{self.__class__.__name__}] RT {line_id} @ {physical_station_id} -> {len(filtered_routes)} routes (taken from pool of {len(all_routes)}) ({elapsed:.4f}s)")
         
         return filtered_routes
\ No newline at end of file
@@ -1,10 +1,12 @@
 import asyncio
 import inspect
 import logging
-from typing import List, Optional, Tuple
+from typing import ClassVar, List, Optional, Tuple
 from datetime import date, datetime, time, timezone
 from functools import wraps
 
+from cachetools import TTLCache
+
 # SQLAlchemy & DB
 from sqlalchemy import select, delete, update, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -125,9 +127,20 @@ class UserDataManager:
         TransportType.RODALIES.value: 3
     }
 
+    # Caché {(origen, id externo): id interno} compartida entre instancias: FastAPI crea
+    # un UserDataManager por petición y cada una resuelve antes al usuario.
+    # Sólo guarda aciertos, así un usuario recién registrado se resuelve a la primera
+    USER_ID_CACHE_TTL: ClassVar[int] = 300
+    _user_id_cache: ClassVar[TTLCache] = TTLCache(maxsize=10_000, ttl=USER_ID_CACHE_TTL)
+
     def __init__(self):
         logger.info("Initializing UserDataManager with New DB Schema & Pydantic...")
 
+    @classmethod
+    def invalidate_user_id_cache(cls):
+        """Vacía la caché de ids tras cualquier cambio de dueño de cuentas o dispositivos."""
+        cls._user_id_cache.clear()
+
     # ---------------------------------------------------------------------
     # MÉTODOS PRIVADOS (RESOLUCIÓN DE USUARIOS)
     # ---------------------------------------------------------------------
@@ -135,6 +148,15 @@ class UserDataManager:
     async def _resolve_user_internal_id(self, session: AsyncSession, external_id: str, source: str) -> Optional[int]:
         if not external_id: return None
 
+        cache_key = (str(source), str(external_id))
+        user_id = self._user_id_cache.get(cache_key)
+        if user_id is None:
+            user_id = await self._query_user_internal_id(session, external_id, source)
+            if user_id:
+                self._user_id_cache[cache_key] = user_id
+        return user_id
+
+    async def _query_user_internal_id(self, session: AsyncSession, external_id: str, source: str) -> Optional[int]:
         if source == ClientType.TELEGRAM.value:
             stmt = select(DBUser.id).where(DBUser.telegram_id == str(external_id))
             res = await session.execute(stmt)
@@ -157,12 +179,26 @@ class UserDataManager:
             return res_device.scalars().first()
     
     async def get_user_id_by_google_uid(self, google_uid: str) -> Optional[int]:
+        cache_key = ("firebase_uid", str(google_uid))
+        user_id = self._user_id_cache.get(cache_key)
+        if user_id is not None:
+            return user_id
+
         async with async_session_factory() as session:
             stmt = select(DBUser.id).where(DBUser.firebase_uid == str(google_uid))
             res = await session.execute(stmt)
-            return res.scalars().first()
+            user_id = res.scalars().first()
+
+        if user_id:
+            self._user_id_cache[cache_key] = user_id
+        return user_id
 
     async def get_user_id_by_installation_id(self, installation_id: str) -> Optional[int]:
+        cache_key = ("installation_id", str(installation_id))
+        user_id = self._user_id_cache.get(cache_key)
+        if user_id is not None:
+            return user_id
+
         async with async_session_factory() as session:
             stmt = (
                 select(DBUserDevice.user_id)
@@ -170,7 +206,11 @@ class UserDataManager:
                 .order_by(DBUserDevice.id.desc()) 
             )
             res = await session.execute(stmt)
-            return res.scalars().first()
+            user_id = res.scalars().first()
+
+        if user_id:
+            self._user_id_cache[cache_key] = user_id
+        return user_id
 
     async def save_audit_log_background(self, user_id_ext, source, action, details):
         async with async_session_factory() as session:
@@ -230,6 +270,8 @@ class UserDataManager:
                         fcm_token=fcm_token
                     )
 
+            # El alta limpia dispositivos con el mismo token FCM y puede cambiar su dueño
+            self.invalidate_user_id_cache()
             return is_new
         
     # ---------------------------
@@ -661,6 +703,21 @@ class UserDataManager:
             
             return result.scalar_one_or_none() is not None
 
+    async def get_sent_notification_keys(self, alert_ids: List[str]) -> set:
+        """
+        Devuelve los pares (user_id, alert_id) ya notificados para las alertas indicadas.
+        Una sola consulta en lugar de un has_notification_been_sent por usuario y alerta.
+        """
+        if not alert_ids:
+            return set()
+
+        async with async_session_factory() as session:
+            stmt = select(DBNotificationLog.user_id, DBNotificationLog.alert_id).where(
+                DBNotificationLog.alert_id.in_([str(a) for a in alert_ids])
+            )
+            result = await session.execute(stmt)
+            return {(str(user_id), alert_id) for user_id, alert_id in result.all()}
+
     async def log_notification_sent(self, user_id: str, alert_id: str):
         """
         Crea el registro en DBNotificationLog.
@@ -1,5 +1,9 @@
 import unicodedata
 import re
+from functools import lru_cache
+
+NON_ALNUM_PATTERN = re.compile(r'[^a-zA-Z0-9\s]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
 
 class HtmlHelper:
 
@@ -24,6 +28,7 @@ class HtmlHelper:
     
 
     @staticmethod
+    @lru_cache(maxsize=8192)  # Los nombres de estación se repiten en cada búsqueda
     def normalize_text(text: str) -> str:
         """
         Normaliza un texto eliminando acentos, símbolos especiales y espacios extra.
@@ -37,19 +42,15 @@ class HtmlHelper:
         # 1. Normalizar el texto a forma NFD para separar caracteres base y diacríticos
         text = unicodedata.normalize('NFD', text)
 
-        # 2. Eliminar los diacríticos (acentos, tildes, etc.)
-        text = ''.join(
-            char for char in text 
-            if unicodedata.category(char) != 'Mn'
-        )
-
-        # 3. Eliminar cualquier caracter que no sea alfanumérico, espacio o guion bajo
-        text = re.sub(r'[^a-zA-Z0-9\s]', '', text)
+        # 2. Eliminar los diacríticos y cualquier caracter que no sea alfanumérico o espacio.
+        # Los diacríticos (categoría Mn) nunca son ASCII ni espacios, así que esta misma
+        # expresión los quita sin recorrer el texto carácter a carácter en Python
+        text = NON_ALNUM_PATTERN.sub('', text)
 
-        # 4. Convertir múltiples espacios en uno solo
-        text = re.sub(r'\s+', ' ', text)
+        # 3. Convertir múltiples espacios en uno solo
+        text = WHITESPACE_PATTERN.sub(' ', text)
 
-        # 5. Eliminar espacios al inicio y final
+        # 4. Eliminar espacios al inicio y final
         return text.strip()
     
     @staticmethod
@@ -2,19 +2,22 @@ import re
 
 from src.domain.models.common.line import Line
 
+# Compilados una sola vez: sort_lines se llama para cada línea en cada ordenación
+LINE_NAME_PATTERN = re.compile(r"L(\d+)([A-Z]?)")
+# Queremos que los que no tienen sufijo vayan después de N/S
+SUFFIX_ORDER = {"N": 0, "S": 1, "": 2}
+
 
 class Utils:
 
     @staticmethod
     def sort_lines(line: Line):
         # Buscar número y sufijo opcional
-        match = re.match(r"L(\d+)([A-Z]?)", line.name)
+        match = LINE_NAME_PATTERN.match(line.name)
         if not match:
             return (999, "")  # Los que no encajan van al final
 
         num = int(match.group(1))          # Número principal
         suffix = match.group(2) or ""      # Sufijo opcional
 
-        # Queremos que los que no tienen sufijo vayan después de N/S
-        suffix_order = {"N": 0, "S": 1, "": 2}
-        return (num, suffix_order.get(suffix, 3))
\ No newline at end of file
+        return (num, SUFFIX_ORDER.get(suffix, 3))
\ No newline at end of file
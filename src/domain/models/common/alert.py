@@ -5,7 +5,7 @@ import html
 
 from src.domain.enums.transport_type import TransportType
 
-@dataclass
+@dataclass(slots=True)
 class Publication:
     headerCa: str
     headerEn: str
@@ -14,7 +14,7 @@ class Publication:
     textEn: str
     textEs: str
 
-@dataclass
+@dataclass(slots=True)
 class AffectedEntity:
     direction_code: str
     direction_name: str
@@ -25,7 +25,7 @@ class AffectedEntity:
     station_code: str
     station_name: str
 
-@dataclass
+@dataclass(slots=True)
 class Alert:
     id: str
     transport_type: TransportType
@@ -235,6 +235,11 @@ class DBPhysicalStation(Base):
     # Relación inversa: Acceso a todos los RouteStops que ocurren aquí
     route_stops = relationship("DBRouteStop", back_populates="station", cascade="all, delete-orphan")
 
+    @property
+    def original_id(self) -> str:
+        # "bus-237" -> "237" (sin crear una lista como haría split)
+        return self.id.rpartition('-')[2]
+
     def __repr__(self):
         return f"<PhysicalStation(id={self.id}, name={self.name})>"
     
@@ -1,5 +1,6 @@
 from typing import List, Optional
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from src.domain.schemas.models import DBLine
@@ -37,8 +38,43 @@ class LineRepository:
             return result.scalars().all()
 
     async def upsert_many(self, lines: List[DBLine]):
+        if not lines:
+            return
+
+        # Un único INSERT ... ON CONFLICT en lugar de un merge (SELECT + UPDATE/INSERT) por línea.
+        # Deduplicamos por id: Postgres no admite tocar la misma fila dos veces en una sentencia.
+        values_by_id = {}
+        for line in lines:
+            values_by_id[line.id] = {
+                "id": line.id,
+                "original_id": line.original_id,
+                "code": line.code,
+                "name": line.name,
+                "description": line.description,
+                "origin": line.origin,
+                "destination": line.destination,
+                "color": line.color,
+                "transport_type": line.transport_type,
+                "extra_data": line.extra_data
+            }
+
         async with self.session_factory() as session:
-            for line in lines:
-                await session.merge(line)
-            
-            await session.commit()
\ No newline at end of file
+            stmt = insert(DBLine).values(list(values_by_id.values()))
+
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['id'],
+                set_={
+                    "original_id": stmt.excluded.original_id,
+                    "code": stmt.excluded.code,
+                    "name": stmt.excluded.name,
+                    "description": stmt.excluded.description,
+                    "origin": stmt.excluded.origin,
+                    "destination": stmt.excluded.destination,
+                    "color": stmt.excluded.color,
+                    "transport_type": stmt.excluded.transport_type,
+                    "extra_data": stmt.excluded.extra_data
+                }
+            )
+
+            await session.execute(stmt)
+            await session.commit()
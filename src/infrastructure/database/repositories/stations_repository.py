@@ -1,4 +1,4 @@
-from typing import List, Optional, Tuple
+from typing import AsyncIterator, List, Optional, Tuple
 from sqlalchemy.orm import selectinload, joinedload
 from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
@@ -46,13 +46,35 @@ class StationsRepository:
                 .where(DBRouteStop.line_id == line_db_id)
                 .order_by(DBRouteStop.order)
                 .options(
-                    joinedload(DBRouteStop.station),                    
-                    selectinload(DBRouteStop.line) 
+                    # Todas las paradas comparten la misma línea (many-to-one): JOIN en la misma consulta
+                    joinedload(DBRouteStop.station),
+                    joinedload(DBRouteStop.line)
                 )
             )
             result = await session.execute(stmt)
             return result.scalars().all()
 
+    async def stream_by_line_id(self, line_db_id: str, batch_size: int = 100) -> AsyncIterator[DBRouteStop]:
+        """
+        Igual que get_by_line_id, pero entrega las paradas según llegan de la DB (cursor en servidor)
+        en lugar de materializar toda la lista.
+        """
+        async with self.session_factory() as session:
+            stmt = (
+                select(DBRouteStop)
+                .where(DBRouteStop.line_id == line_db_id)
+                .order_by(DBRouteStop.order)
+                .options(
+                    # Con yield_per un selectinload lanzaría un SELECT ... IN extra por cada lote
+                    joinedload(DBRouteStop.station),
+                    joinedload(DBRouteStop.line)
+                )
+                .execution_options(yield_per=batch_size)
+            )
+            result = await session.stream_scalars(stmt)
+            async for route_stop in result:
+                yield route_stop
+
     async def get_stop_by_physical_and_line_id(self, physical_id: str, line_id: str) -> Optional[DBRouteStop]:
         async with self.session_factory() as session:
             stmt = (
@@ -87,6 +109,8 @@ class StationsRepository:
                 .join(DBRouteStop, DBPhysicalStation.id == DBRouteStop.physical_station_id)
                 .where(DBRouteStop.station_external_code == code)
                 .where(DBPhysicalStation.transport_type == transport_type)
+                # El mismo código aparece en varias paradas de ruta: con la primera basta
+                .limit(1)
             )
             
             result = await session.execute(stmt)
@@ -203,35 +203,29 @@ class FgcApiService:
         
 
     async def get_next_departures(self, station_name: str, line_name: str, max_results: int = 5) -> Dict[str, List[Dict]]:
-        log_file = "realtime_departures.log"
-
         madrid_tz = ZoneInfo("Europe/Madrid")
-
-        def log(msg: str):
-            with open(log_file, "a", encoding="utf-8") as f:
-                f.write(f"{datetime.now(tz=madrid_tz).strftime('%Y-%m-%d %H:%M:%S')} - {msg}\n")
-
-        with open(log_file, "w", encoding="utf-8") as f:
-            f.write("=== Nueva ejecución ===\n")
+        # Trazas de depuración: formato diferido (%s) para no convertir DataFrames ni el feed
+        # a texto cuando DEBUG está desactivado, y sin escribir ficheros desde el event loop
+        log = self.logger.debug
 
         await self._load_csvs()
 
         stop = self._stops[self._stops["stop_name"].str.lower() == station_name.lower()]
         if stop.empty:
-            log(f"No se encontró la estación {station_name}")
+            log("No se encontró la estación %s", station_name)
             return {}
         stop_id = stop.iloc[0]["stop_id"]
-        log(f"STOP ({stop_id}):\n{stop}")
+        log("STOP (%s):\n%s", stop_id, stop)
 
         route = self._routes[self._routes["route_short_name"] == line_name]
         if route.empty:
-            log(f"No se encontró la línea {line_name}")
+            log("No se encontró la línea %s", line_name)
             return {}
         route_id = route.iloc[0]["route_id"]
-        log(f"ROUTE ({route_id}):\n{route}")
+        log("ROUTE (%s):\n%s", route_id, route)
 
         trip_ids = set(self._trips[self._trips["route_id"] == route_id]["trip_id"])
-        log(f"TRIPS_IDS for '{route_id}':\n{trip_ids}")
+        log("TRIPS_IDS for '%s':\n%s", route_id, trip_ids)
 
         departures_by_direction = {}
         now_ts = time.time()
@@ -242,13 +236,13 @@ class FgcApiService:
             feed = gtfs_realtime_pb2.FeedMessage()
             feed.ParseFromString(data)
         except Exception as e:
-            log(f"No se pudo descargar/parsear feed RT: {e}")
+            log("No se pudo descargar/parsear feed RT: %s", e)
             feed = None
 
         rt_trip_ids = set()
 
         if feed:
-            log(f"FEED: \n{feed.entity}")
+            log("FEED: \n%s", feed.entity)
             for entity in feed.entity:
                 if not entity.HasField("trip_update"):
                     continue
@@ -285,7 +279,7 @@ class FgcApiService:
                         "type": "RT"
                     })
                     rt_trip_ids.add(trip_update.trip.trip_id)
-                    log(f"--> Coincidencia RT: trip_id={trip_update.trip.trip_id}, ts={ts}, direction={direction_name}")
+                    log("--> Coincidencia RT: trip_id=%s, ts=%s, direction=%s", trip_update.trip.trip_id, ts, direction_name)
 
                     if len(departures_by_direction[direction_name]) >= max_results:
                         break
@@ -296,7 +290,7 @@ class FgcApiService:
         ].copy()
 
         if stop_times_for_stop.empty:
-            log(f"No hay salidas planificadas para {station_name}")
+            log("No hay salidas planificadas para %s", station_name)
             return departures_by_direction
 
         def to_timestamp(dep_time: str) -> float:
@@ -372,5 +366,5 @@ class FgcApiService:
 
         departures_by_direction = dict(sorted(departures_by_direction.items(), key=lambda x: x[0]))
 
-        log(f"Salidas agrupadas por dirección para {station_name} ({line_name}): {departures_by_direction}")
+        log("Salidas agrupadas por dirección para %s (%s): %s", station_name, line_name, departures_by_direction)
         return departures_by_direction
\ No newline at end of file
@@ -73,8 +73,7 @@ class TmbApiService:
         data = await self._get(url)
         features = data['features']
 
-        lines = []
-        lines.extend(LineMapper.map_bus_line(feature) for feature in features if feature['properties']['NOM_FAMILIA'] and 'Llançadores' not in feature['properties']['NOM_LINIA'])
+        lines = [LineMapper.map_bus_line(feature) for feature in features if feature['properties']['NOM_FAMILIA'] and 'Llançadores' not in feature['properties']['NOM_LINIA']]
         lines.sort(key=self._natural_key)
         return lines
 
@@ -89,8 +88,7 @@ class TmbApiService:
         data = await self._get(url)
         features = data['features']
 
-        lines = []
-        lines.extend(LineMapper.map_metro_line(feature) for feature in features if feature['properties']['NOM_LINIA'] and "FM" not in feature['properties']['NOM_LINIA'])
+        lines = [LineMapper.map_metro_line(feature) for feature in features if feature['properties']['NOM_LINIA'] and "FM" not in feature['properties']['NOM_LINIA']]
         lines.sort(key=lambda x: x.name)
         return lines
 
@@ -99,8 +97,7 @@ class TmbApiService:
         data = await self._get(url)
         features = data['features']
 
-        stations = []
-        stations.extend(StationMapper.map_metro_station(feature) for feature in features)
+        stations = [StationMapper.map_metro_station(feature) for feature in features]
         stations.sort(key=lambda x: x.order)
         return stations
 
@@ -233,19 +230,20 @@ class TmbApiService:
         connections = []
         for feature in features:
             props = feature["properties"]
-            if str(props['NOM_OPERADOR']).lower() == str(TransportType.METRO.value).lower():
+            operator = str(props['NOM_OPERADOR']).lower()
+            if operator == TransportType.METRO.value:
                 connection = LineMapper.map_metro_line(feature)
                 connections.append(connection)
-            elif str(props['NOM_OPERADOR']).lower() == "tb":
+            elif operator == "tb":
                 connection = LineMapper.map_bus_line(feature)
                 connections.append(connection)
-            elif str(props['NOM_OPERADOR']).lower() == str(TransportType.TRAM.value).lower():
+            elif operator == TransportType.TRAM.value:
                 connection = LineMapper.map_tram_connection(str(props.get('ID_LINIA')), str(props.get('CODI_LINIA')), props.get('NOM_LINIA'),  props.get('DESC_LINIA'), props.get('ORIGEN_LINIA'), props.get('DESTI_LINIA'))
                 connections.append(connection)
-            elif str(props['NOM_OPERADOR']).lower() == str(TransportType.RODALIES.value).lower():
+            elif operator == TransportType.RODALIES.value:
                 connection = LineMapper.map_rodalies_connection(str(props.get('ID_LINIA')), str(props.get('CODI_LINIA')), props.get('NOM_LINIA'), props.get('DESC_LINIA'), props.get('COLOR_LINIA'))
                 connections.append(connection)
-            elif str(props['NOM_OPERADOR']).lower() == str(TransportType.FGC.value).lower():
+            elif operator == TransportType.FGC.value:
                 connection = LineMapper.map_fgc_connection(str(props.get('ID_LINIA')), str(props.get('CODI_LINIA')), props.get('NOM_LINIA'), props.get('DESC_LINIA'), props.get('COLOR_LINIA'))
                 connections.append(connection)
 
@@ -160,9 +160,7 @@ class TramApiService:
 
         api_stops = await self._request("GET", f"/lines/{line_id}/stops", params=params)
 
-        stops = []
-        stops.extend(StationMapper.map_tram_station(stop, line_id) for stop in api_stops)
-        return stops    
+        return [StationMapper.map_tram_station(stop, line_id) for stop in api_stops]
 
     async def get_connections_at_stop(
         self,
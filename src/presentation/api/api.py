@@ -27,7 +27,6 @@ from src.application.services.transport.rodalies_service import RodaliesService
 from src.application.services.transport.tram_service import TramService
 
 from src.application.utils.distance_helper import DistanceHelper
-from src.application.utils.utils import Utils
 
 from src.domain.enums.clients import ClientType
 
@@ -162,7 +161,7 @@ def get_tram_router(
 
     @router.get("/lines")
     async def list_tram_lines():
-        return sorted(await tram_service.get_all_lines(), key=Utils.sort_lines)
+        return await tram_service.get_all_lines()
     
     @router.get("/lines/{line_id}", response_model=Line)
     async def get_tram_line_by_id(line_id: str):
@@ -210,7 +209,7 @@ def get_rodalies_router(
 
     @router.get("/lines")
     async def list_rodalies_lines():
-        return sorted(await rodalies_service.get_all_lines(), key=Utils.sort_lines)
+        return await rodalies_service.get_all_lines()
     
     @router.get("/lines/{line_id}", response_model=Line)
     async def get_rodalies_line_by_id(line_id: str):
@@ -273,7 +272,7 @@ def get_fgc_router(
 
     @router.get("/lines")
     async def list_fgc_lines():
-        return sorted(await fgc_service.get_all_lines(), key=Utils.sort_lines)
+        return await fgc_service.get_all_lines()
     
     @router.get("/lines/{line_id}", response_model=Line)
     async def get_fgc_line_by_id(line_id: str):
@@ -495,6 +494,9 @@ def get_user_router(
         except Exception as e:
             logger.error(f"Error en login: {e}") 
             raise HTTPException(status_code=500, detail="Error interno del servidor")
+        finally:
+            # Fusiones, promociones y robos de dispositivo cambian a qué usuario apunta cada id
+            UserDataManager.invalidate_user_id_cache()
 
     @router.post("/auth/logout", status_code=status.HTTP_200_OK)
     async def logout(
@@ -507,6 +509,7 @@ def get_user_router(
             user_id=uid, 
             installation_id=request.installation_id
         )
+        UserDataManager.invalidate_user_id_cache()
 
         if not deleted:
             raise HTTPException(
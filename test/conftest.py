@@ -4,6 +4,7 @@ import asyncio
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy import text
 from src.infrastructure.database.database import async_session_factory
+from src.application.services.user_data_manager import UserDataManager
 from unittest.mock import MagicMock
 from main import get_fastapi_app
 
@@ -40,6 +41,9 @@ async def clean_db():
         # Agrega otras tablas si es necesario (favorites, logs...)
         await session.commit()
 
+    # La caché de ids de usuario es de proceso: tras vaciar las tablas apuntaría a usuarios borrados
+    UserDataManager.invalidate_user_id_cache()
+
 # 4. Mock de Firebase Auth
 @pytest.fixture(scope="function")
 def mock_firebase_auth(monkeypatch):
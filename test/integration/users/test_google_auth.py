@@ -7,6 +7,7 @@ from sqlalchemy.orm import selectinload
 from src.infrastructure.database.database_helper import DatabaseHelper
 from src.domain.schemas.models import DBUser, DBUserCard, DBUserSettings, DBFavorite, UserDevice
 from src.infrastructure.database.database import async_session_factory
+from src.application.services.user_data_manager import UserDataManager
 
 ENDPOINT = "/api/users/auth/google"
 
@@ -269,4 +270,35 @@ async def test_google_login_scenario_4(client, mock_firebase_auth):
         assert res_devices_count.scalar() == 1
 
         res_settings_count = await session.execute(select(func.count()).select_from(DBUserSettings))
-        assert res_settings_count.scalar() == 1
\ No newline at end of file
+        assert res_settings_count.scalar() == 1
+
+
+# DEVICE TAKEOVER
+# Caso: El dispositivo de un anónimo pasa a la cuenta Google al hacer login en él.
+#       Resultado: su installation_id resuelve al nuevo dueño aunque estuviera en caché.
+@pytest.mark.asyncio
+async def test_google_login_device_takeover_resolves_to_new_owner(client, mock_firebase_auth):
+    install_id_anonymous = str(uuid.uuid4())
+    install_id_registered = str(uuid.uuid4())
+
+    async with async_session_factory() as session:
+        anon_user = await DatabaseHelper.insert_anonymous_user(session, install_id_anonymous)
+        anon_id = anon_user.id
+        google_user = await DatabaseHelper.insert_registered_user(session, install_id_registered)
+        google_id = google_user.id
+        await session.commit()
+
+    # Calentamos la caché de resolución con el dueño anónimo
+    user_data_manager = UserDataManager()
+    assert await user_data_manager.get_user_id_by_installation_id(install_id_anonymous) == anon_id
+
+    payload = {
+        "id_token": "valid_google_token",
+        "user_id": install_id_anonymous,
+        "fcm_token": "token_takeover"
+    }
+    response = await client.post(ENDPOINT, json=payload)
+    assert response.status_code == 200
+
+    resolved = await user_data_manager.get_user_id_by_installation_id(install_id_anonymous)
+    assert resolved == google_id, f"El dispositivo debería resolver al usuario Google {google_id}, resuelve a {resolved}"
@@ -3,6 +3,7 @@ import uuid
 from sqlalchemy import func, select
 from src.infrastructure.database.database_helper import DatabaseHelper
 from src.domain.schemas.models import DBUser, UserDevice
+from src.application.services.user_data_manager import UserDataManager
 from src.infrastructure.database.database import async_session_factory
 from sqlalchemy.orm import selectinload
 
@@ -66,4 +67,28 @@ async def test_logout_wrong_device_or_user(client, mock_firebase_auth):
     response = await client.post(ENDPOINT_LOGOUT, json=payload, headers=headers)
 
     assert response.status_code == 404
-    assert "not found" in response.json()["detail"].lower()
\ No newline at end of file
+    assert "not found" in response.json()["detail"].lower()
+
+@pytest.mark.asyncio
+async def test_logout_installation_id_stops_resolving(client, mock_firebase_auth):
+    install_id = str(uuid.uuid4())
+
+    async with async_session_factory() as session:
+        user = await DatabaseHelper.insert_registered_user(session, install_id)
+        user_id = user.id
+        await session.commit()
+
+    # Calentamos la caché de resolución con el dispositivo antes del logout
+    user_data_manager = UserDataManager()
+    assert await user_data_manager.get_user_id_by_installation_id(install_id) == user_id
+
+    headers = {"Authorization": "Bearer valid_google_token"}
+    response = await client.post(ENDPOINT_LOGOUT, json={"installation_id": install_id}, headers=headers)
+    assert response.status_code == 200
+
+    resolved = await user_data_manager.get_user_id_by_installation_id(install_id)
+    assert resolved is None, f"El dispositivo desvinculado no debería resolver a ningún usuario, resuelve a {resolved}"
+
+    # El dispositivo tampoco sirve ya como credencial en la API
+    response = await client.post(ENDPOINT_LOGOUT, json={"installation_id": install_id}, headers={"X-User-Id": install_id})
+    assert response.status_code == 401
@@ -3,6 +3,7 @@ import uuid
 
 from sqlalchemy import func, select
 
+from src.application.services.user_data_manager import UserDataManager
 from src.domain.schemas.models import DBUser, DBUserSettings, UserDevice
 from src.infrastructure.database.database import async_session_factory
 from src.infrastructure.database.database_helper import DatabaseHelper
@@ -115,4 +116,30 @@ async def test_register_no_fcm_token(client):
 
         assert count_devices == 1, f"Se esperaba 1 dispositivo, se encontraron {count_devices}"
         assert count_users == 1, f"Se esperaba 1 usuario en la DB, se encontraron {count_users}"
-        assert count_settings == 1, f"Se esperaba 1 user settings, se encontraron {count_settings}"
\ No newline at end of file
+        assert count_settings == 1, f"Se esperaba 1 user settings, se encontraron {count_settings}"
+
+@pytest.mark.asyncio
+async def test_register_reused_fcm_token_unlinks_old_installation(client):
+    install_id_old = str(uuid.uuid4())
+    install_id_new = str(uuid.uuid4())
+
+    response = await client.post(ENDPOINT, json={"installation_id": install_id_old, "fcm_token": "token_shared"})
+    assert response.status_code == 201
+
+    # Calentamos la caché de resolución con la instalación antigua
+    user_data_manager = UserDataManager()
+    old_user_id = await user_data_manager.get_user_id_by_installation_id(install_id_old)
+    assert old_user_id is not None
+
+    # Reinstalación: mismo token FCM, nuevo installation_id -> el dispositivo antiguo se borra
+    response = await client.post(ENDPOINT, json={"installation_id": install_id_new, "fcm_token": "token_shared"})
+    assert response.status_code == 201
+
+    resolved = await user_data_manager.get_user_id_by_installation_id(install_id_old)
+    assert resolved is None, f"La instalación antigua no debería resolver a ningún usuario, resuelve a {resolved}"
+
+    async with async_session_factory() as session:
+        res = await session.execute(select(UserDevice.user_id).where(UserDevice.installation_id == install_id_new))
+        new_user_id = res.scalars().first()
+
+    assert await user_data_manager.get_user_id_by_installation_id(install_id_new) == new_user_id
@@ -0,0 +1,6 @@
+import pytest
+
+# Los tests unitarios no tocan la base de datos: anulamos la limpieza automática de test/conftest.py
+@pytest.fixture(scope="function", autouse=True)
+async def clean_db():
+    yield
@@ -0,0 +1,67 @@
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from src.application.services.alerts_service import AlertsService
+from src.domain.enums.transport_type import TransportType
+from src.domain.models.common.user import User
+from src.domain.schemas.favorite import FavoriteResponse
+
+USER_ID = "42"
+STATION_CODE = "123"
+
+
+def db_alert(external_id: str):
+    return SimpleNamespace(
+        external_id=external_id,
+        transport_type=TransportType.METRO.value,
+        begin_date=datetime.now(),
+        end_date=None,
+        status="ACTIVE",
+        cause="TECHNICAL",
+        publications=[],
+        affected_entities=[{
+            "direction_code": "", "direction_name": "",
+            "entrance_code": "", "entrance_name": "",
+            "line_code": "L1", "line_name": "L1",
+            "station_code": STATION_CODE, "station_name": "Catalunya"
+        }]
+    )
+
+
+def device_entry(fcm_token: str):
+    user = User(user_id=USER_ID, created_at=datetime.now(), fcm_token=fcm_token)
+    favorite = FavoriteResponse(
+        type=TransportType.METRO.value,
+        physical_station_id="P1",
+        station_code=STATION_CODE,
+        station_name="Catalunya",
+        line_id="L1",
+        line_name="L1",
+        line_code="L1",
+        coordinates=[41.38, 2.17]
+    )
+    return user, [favorite]
+
+
+@pytest.mark.asyncio
+async def test_check_new_alerts_notifies_each_user_once_per_alert():
+    user_data_manager = MagicMock()
+    # Un mismo usuario con dos dispositivos: get_active_users_with_favorites devuelve una entrada por token
+    user_data_manager.get_active_users_with_favorites = AsyncMock(
+        return_value=[device_entry("token_A"), device_entry("token_B")]
+    )
+    # La alerta OLD ya se le notificó en una pasada anterior
+    user_data_manager.get_sent_notification_keys = AsyncMock(return_value={(USER_ID, "OLD")})
+
+    service = AlertsService(user_data_manager)
+    service.alerts_repository = MagicMock()
+    service.alerts_repository.get_active_alerts = AsyncMock(return_value=[db_alert("NEW"), db_alert("OLD")])
+    service._notify_user = AsyncMock()
+
+    await service.check_new_alerts()
+
+    notified = [(call.args[0].user_id, call.args[1].id) for call in service._notify_user.call_args_list]
+    assert notified == [(USER_ID, "NEW")], f"Se esperaba una sola notificación de NEW, se encolaron {notified}"
+    assert all(call.kwargs.get("already_checked") for call in service._notify_user.call_args_list)
@@ -0,0 +1,64 @@
+import pytest
+from unittest.mock import MagicMock
+
+from src.application.services.transport.bicing_service import BicingService
+from src.application.services.transport.service_base import ServiceBase
+from src.domain.models.common.search_result import StationSearchResult
+
+# Para "catalunya": dos exactas, una normalizada (acento), una fuzzy (errata) y una sin relación
+STATION_NAMES = ["Zona Franca", "Catalnya", "Catalúnya Rambla", "Plaça Catalunya", "Catalunya"]
+
+
+def build_items():
+    return [
+        StationSearchResult(
+            physical_station_id=str(i),
+            station_external_code=str(i),
+            line_id="L1",
+            station_name=name,
+            line_name="L1",
+            line_color="FF0000",
+            type="metro",
+            match_score=0.0
+        )
+        for i, name in enumerate(STATION_NAMES)
+    ]
+
+
+def search(engine, query, limit):
+    items = build_items()
+    if engine == "base":
+        return ServiceBase.fuzzy_search(query, items, key=lambda x: x.station_name, limit=limit)
+    return BicingService(bicing_api_service=MagicMock()).fuzzy_search(query, items, key=lambda x: x.station_name, limit=limit)
+
+
+@pytest.mark.parametrize("engine", ["base", "bicing"])
+def test_fuzzy_search_orders_exact_normalized_fuzzy(engine):
+    results = search(engine, "catalunya", limit=20)
+
+    names = [r.station_name for r in results]
+    assert names == ["Plaça Catalunya", "Catalunya", "Catalúnya Rambla", "Catalnya"], f"Orden inesperado: {names}"
+
+    scores = [r.match_score for r in results]
+    assert scores[:3] == [100.0, 100.0, 95.0]
+    assert 75 <= scores[3] < 95, f"La errata debería entrar por fuzzy, score {scores[3]}"
+
+
+@pytest.mark.parametrize("engine", ["base", "bicing"])
+@pytest.mark.parametrize("limit, expected", [
+    (1, ["Plaça Catalunya"]),
+    (2, ["Plaça Catalunya", "Catalunya"]),
+    (3, ["Plaça Catalunya", "Catalunya", "Catalúnya Rambla"]),
+])
+def test_fuzzy_search_caps_every_pass_at_limit(engine, limit, expected):
+    results = search(engine, "catalunya", limit=limit)
+
+    assert [r.station_name for r in results] == expected
+    assert len(results) <= limit
+
+
+def test_fuzzy_search_does_not_mutate_shared_items():
+    items = build_items()
+    ServiceBase.fuzzy_search("catalunya", items, key=lambda x: x.station_name)
+
+    assert all(item.match_score == 0.0 for item in items), "Los items cacheados se comparten entre búsquedas"
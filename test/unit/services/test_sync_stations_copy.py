@@ -0,0 +1,117 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.application.services.transport import service_base
+from src.application.services.transport.service_base import (
+    PHYSICAL_STATION_COPY_COLUMNS,
+    ROUTE_STOP_COPY_COLUMNS,
+    ServiceBase,
+)
+from src.domain.enums.transport_type import TransportType
+from src.domain.models.common.station import Station
+from src.domain.schemas.models import DBPhysicalStation, DBRouteStop
+
+# Dos paradas de la misma línea y sentido, en orden inverso para comprobar la ordenación
+RAW_STATIONS = [
+    Station(
+        id="2", code="202", name="Passeig de Gràcia", description="Pg. de Gràcia / Aragó",
+        latitude=41.3917, longitude=2.1649, order=2, transport_type=TransportType.METRO,
+        line_code="L3", line_name="L3", station_group_code=7, direction="ida", outbound_code="O2"
+    ),
+    Station(
+        id="1", code="101", name="Catalunya", description="Pl. Catalunya",
+        latitude=41.3870, longitude=2.1700, order=1, transport_type=TransportType.METRO,
+        line_code="L3", line_name="L3", direction="ida", outbound_code="O1"
+    ),
+]
+LINES_MAP = {"metro-L3": {"name": "L3", "id": "metro-L3", "color": "339933"}}
+
+
+class FakeService(ServiceBase):
+    async def fetch_alerts(self): return []
+    async def fetch_lines(self): return []
+    async def fetch_stations(self): return list(RAW_STATIONS)
+    async def fetch_stations_by_line(self, line_id): return []
+
+
+@pytest.fixture
+def copy_calls(monkeypatch):
+    """Sustituye la sesión de DB y devuelve {tabla: records} de cada COPY."""
+    driver_conn = MagicMock()
+    driver_conn.copy_records_to_table = AsyncMock()
+
+    raw_conn = MagicMock(driver_connection=driver_conn)
+    sa_conn = MagicMock()
+    sa_conn.get_raw_connection = AsyncMock(return_value=raw_conn)
+
+    session = MagicMock()
+    session.execute = AsyncMock()
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+    session.connection = AsyncMock(return_value=sa_conn)
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=False)
+
+    monkeypatch.setattr(service_base, "async_session_factory", lambda: session)
+
+    calls = {}
+
+    async def run():
+        await FakeService().sync_stations(TransportType.METRO, LINES_MAP)
+        for call in driver_conn.copy_records_to_table.call_args_list:
+            calls[call.args[0]] = (call.kwargs["columns"], call.kwargs["records"])
+        return calls
+
+    return run
+
+
+def test_copy_columns_exist_in_tables():
+    assert set(PHYSICAL_STATION_COPY_COLUMNS) <= set(DBPhysicalStation.__table__.columns.keys())
+    assert set(ROUTE_STOP_COPY_COLUMNS) <= set(DBRouteStop.__table__.columns.keys())
+
+
+@pytest.mark.asyncio
+async def test_physical_station_records_match_copy_columns(copy_calls):
+    calls = await copy_calls()
+    columns, records = calls["staging_physical_stations"]
+
+    assert columns == PHYSICAL_STATION_COPY_COLUMNS
+    assert len(records) == 2
+    assert all(len(record) == len(columns) for record in records)
+
+    rows = {row["id"]: row for row in (dict(zip(columns, record)) for record in records)}
+    catalunya = rows["metro-1"]
+    assert catalunya["name"] == "Catalunya"
+    assert catalunya["description"] == "Pl. Catalunya"
+    assert catalunya["transport_type"] == "metro"
+    assert (catalunya["latitude"], catalunya["longitude"]) == (41.3870, 2.1700)
+    assert json.loads(catalunya["extra_data"])["outbound_code"] == "O1"
+    assert json.loads(catalunya["lines_summary"]) == [{"name": "L3", "id": "metro-L3", "color": "339933"}]
+    assert rows["metro-2"]["name"] == "Passeig de Gràcia"
+
+
+@pytest.mark.asyncio
+async def test_route_stop_records_match_copy_columns(copy_calls):
+    calls = await copy_calls()
+    columns, records = calls["route_stops"]
+
+    assert columns == ROUTE_STOP_COPY_COLUMNS
+    assert all(len(record) == len(columns) for record in records)
+
+    rows = [dict(zip(columns, record)) for record in records]
+    assert [row["station_external_code"] for row in rows] == ["101", "202"], "Las paradas deben ir por orden"
+    first, last = rows
+    assert first == {
+        "line_id": "metro-L3",
+        "physical_station_id": "metro-1",
+        "station_external_code": "101",
+        "station_group_code": None,
+        "order": 1,
+        "direction": "ida",
+        "is_origin": True,
+        "is_destination": False,
+    }
+    assert last["physical_station_id"] == "metro-2"
+    assert last["station_group_code"] == "7"
+    assert (last["is_origin"], last["is_destination"]) == (False, True)